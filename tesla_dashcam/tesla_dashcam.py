@@ -8,15 +8,21 @@ import os
 import sys
 from platform import processor as platform_processor
 import json
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from glob import glob, iglob
 from pathlib import Path
 from re import match, search, IGNORECASE as re_IGNORECASE
 from shlex import split as shlex_split
 from shutil import which
-from subprocess import CalledProcessError, TimeoutExpired, run
-from tempfile import mkstemp
-from time import sleep, time as timestamp, mktime
+from stat import S_ISREG
+from string import Formatter
+from subprocess import DEVNULL, PIPE, Popen, TimeoutExpired, run
+from tempfile import TemporaryDirectory, mkstemp
+from threading import Event as threading_Event, Lock, Thread
+from time import gmtime, sleep, strftime, time as timestamp, mktime
 from typing import Any, List, Optional
 
 import requests
@@ -45,6 +51,51 @@ if VERSION["beta"] > -1:
 
 MONITOR_SLEEP_TIME = 5
 
+# Folders drives are mounted in, watched for changes when monitoring for the TeslaCam drive.
+MONITOR_DRIVE_FOLDERS = {
+    "darwin": ["/Volumes"],
+}
+
+# Format of timestamps used within the names of the created movie files.
+FILENAME_TIMESTAMP_FORMAT = "%Y-%m-%dT%H-%M-%S"
+
+# Maximum number of files to provide to ffmpeg at once when retrieving metadata.
+METADATA_BATCH_SIZE = 50
+
+# Maximum number of folders for which the metadata is retrieved at the same time.
+METADATA_MAX_WORKERS = 4
+
+# Extension of the file stored next to an event movie file holding its duration.
+MOVIE_SIDECAR_EXTENSION = ".meta.json"
+
+# Maximum number of map tiles kept for creating the title screen of other movies.
+TITLE_MAP_TILE_CACHE_SIZE = 64
+
+# Maximum number of source folders being deleted at the same time.
+DELETE_MAX_WORKERS = 4
+
+# Number of lines of ffmpeg output kept for error reporting.
+FFMPEG_OUTPUT_LINES = 200
+
+# Number of seconds the latest release information is re-used for before checking again.
+RELEASE_CACHE_TIME = 6 * 60 * 60
+
+# Variables that can be used within the text overlay format.
+TEXT_OVERLAY_VARIABLES = frozenset(
+    {
+        "start_timestamp",
+        "end_timestamp",
+        "local_timestamp_rolling",
+        "event_timestamp_countdown",
+        "event_timestamp_countdown_rolling",
+        "event_timestamp",
+        "event_city",
+        "event_reason",
+        "event_latitude",
+        "event_longitude",
+    }
+)
+
 GITHUB = {
     "URL": "https://api.github.com",
     "owner": "ehendrix23",
@@ -68,6 +119,11 @@ MOVIE_HOMEDIR = {
     "freebsd11": "Videos/Tesla_Dashcam",
 }
 
+RELEASE_CACHE_DIR = {
+    "darwin": "Library/Caches/tesla_dashcam",
+    "win32": "AppData/Local/tesla_dashcam",
+}
+
 DEFAULT_CLIP_HEIGHT = 960
 DEFAULT_CLIP_WIDTH = 1280
 
@@ -94,6 +150,30 @@ MOVIE_ENCODING = {
     "x265_rpi": "h265",
 }
 
+# GPU types in order of preference when determining the GPU type from the hardware
+# encoders supported by ffmpeg.
+GPU_TYPE_ORDER = ["nvidia", "intel", "vaapi"]
+
+# Files providing the PCI vendor ID of the GPU for each render device on Linux.
+RENDER_DEVICE_VENDOR_FILES = "/sys/class/drm/renderD*/device/vendor"
+
+# Render device used for VAAPI.
+VAAPI_DEVICE = "/dev/dri/renderD128"
+
+# PCI vendor IDs of the GPUs with hardware encoding through QSV (Intel) and VAAPI.
+GPU_VENDOR_INTEL = "0x8086"
+GPU_VENDORS_VAAPI = [GPU_VENDOR_INTEL, "0x1002"]
+
+# Input options to have the clips decoded by the GPU as well. The decoded frames are
+# returned to system memory as the filters are done in software.
+# The native h264 decoder has no QSV hwaccel, the QSV decoder itself is used instead.
+MOVIE_HWACCEL_DECODE = {
+    "mac": ["-hwaccel", "videotoolbox"],
+    "nvidia": ["-hwaccel", "cuda"],
+    "intel": ["-c:v", "h264_qsv"],
+    "qsv": ["-c:v", "h264_qsv"],
+}
+
 DEFAULT_FONT = {
     "darwin": "/Library/Fonts/Arial Unicode.ttf",
     "win32": "/Windows/Fonts/arial.ttf",
@@ -102,6 +182,25 @@ DEFAULT_FONT = {
     "freebsd11": "/usr/share/local/fonts/freefont-ttf/FreeSans.ttf",
 }
 
+# Characters to escape in the text for ffmpeg.
+FFMPEG_TEXT_ESCAPE = str.maketrans({":": "\\:"})
+
+# Short stream labels for the cameras within the ffmpeg filters.
+FFMPEG_CAMERA_LABEL = {"front": "F", "left": "L", "right": "R", "rear": "B"}
+
+# Filter for a camera clip, and for putting the camera on top of the previous one.
+FFMPEG_CAMERA_FILTER = (
+    "setpts=PTS-STARTPTS, scale={clip_width}x{clip_height} {mirror}{options}{fps}"
+    " [{camera}]"
+)
+FFMPEG_CAMERA_OVERLAY = (
+    ";[{input_clip}][{camera}] overlay=eof_action=pass:repeatlast=0:"
+    "x={x_pos}:y={y_pos} [{camera}1]"
+)
+
+# Filter passing the previous camera on when there is no clip for the camera.
+FFMPEG_CAMERA_SKIP = ";[{input_clip}] null [{camera}1]"
+
 HALIGN = {"LEFT": "10", "CENTER": "(w/2-text_w/2)", "RIGHT": "(w-text_w)"}
 
 VALIGN = {"TOP": "10", "MIDDLE": "(h/2-(text_h/2))", "BOTTOM": "(h-(text_h)-10)"}
@@ -117,6 +216,8 @@ EVENT_REASON = {
 
 TOASTER_INSTANCE = None
 
+LOCAL_TIMEZONE = None
+
 display_ts = False
 
 PLATFORM = sys.platform
@@ -207,6 +308,7 @@ class Clip(object):
         self._end_timestamp = None
         self._duration = None
         self._cameras = {}
+        self._sorted = None
 
     @property
     def timestamp(self):
@@ -225,6 +327,7 @@ class Clip(object):
 
     def set_camera(self, name, camera_info: Camera_Clip):
         self._cameras.update({name: camera_info})
+        self._sorted = None
 
     @property
     def cameras(self):
@@ -292,9 +395,12 @@ class Clip(object):
 
     @property
     def sorted(self):
-        return sorted(
-            self._cameras, key=lambda camera: self._cameras[camera].start_timestamp
-        )
+        # Sorted list is kept until another camera is added.
+        if self._sorted is None:
+            self._sorted = sorted(
+                self._cameras, key=lambda camera: self._cameras[camera].start_timestamp
+            )
+        return self._sorted
 
 
 class Event(object):
@@ -309,6 +415,7 @@ class Event(object):
         self._end_timestamp = None
         self._duration = None
         self._clips = {}
+        self._sorted = None
 
     @property
     def folder(self):
@@ -347,6 +454,7 @@ class Event(object):
 
     def set_clip(self, timestamp, clip_info: Clip):
         self._clips.update({timestamp: clip_info})
+        self._sorted = None
 
     def item(self, value):
         return self.clip(value)
@@ -418,7 +526,12 @@ class Event(object):
 
     @property
     def sorted(self):
-        return sorted(self._clips, key=lambda clip: self._clips[clip].start_timestamp)
+        # Sorted list is kept until another clip is added.
+        if self._sorted is None:
+            self._sorted = sorted(
+                self._clips, key=lambda clip: self._clips[clip].start_timestamp
+            )
+        return self._sorted
 
     def template(self, template, timestamp_format, video_settings):
         # This will also be called if no merging is going to occur (template = None) or
@@ -426,17 +539,13 @@ class Event(object):
         if template is None or template == "":
             return ""
 
+        start_timestamp = format_timestamp(self.start_timestamp, timestamp_format)
+        end_timestamp = format_timestamp(self.end_timestamp, timestamp_format)
         replacement_strings = {
             "layout": video_settings["movie_layout"],
-            "start_timestamp": self.start_timestamp.astimezone(
-                get_localzone()
-            ).strftime(timestamp_format),
-            "end_timestamp": self.end_timestamp.astimezone(get_localzone()).strftime(
-                timestamp_format
-            ),
-            "event_timestamp": self.start_timestamp.astimezone(
-                get_localzone()
-            ).strftime(timestamp_format),
+            "start_timestamp": start_timestamp,
+            "end_timestamp": end_timestamp,
+            "event_timestamp": start_timestamp,
             "event_city": self.metadata.get("city", "") or "",
             "event_reason": self.metadata.get("reason", "") or "",
             "event_latitude": self.metadata.get("latitude", "") or "",
@@ -444,15 +553,13 @@ class Event(object):
         }
 
         if self.metadata.get("event_timestamp") is not None:
-            replacement_strings["event_timestamp"] = (
-                self.metadata.get("event_timestamp")
-                .astimezone(get_localzone())
-                .strftime(timestamp_format)
+            replacement_strings["event_timestamp"] = format_timestamp(
+                self.metadata.get("event_timestamp"), timestamp_format
             )
 
         try:
             # Try to replace strings!
-            template = template.format(**replacement_strings)
+            template = compile_template(template)(replacement_strings)
         except KeyError as e:
             print(
                 f"{get_current_timestamp()}Bad string format for merge template: Invalid variable {str(e)}"
@@ -460,10 +567,7 @@ class Event(object):
             template = None
 
         if template == "":
-            template = (
-                f"{self.start_timestamp.astimezone(get_localzone()).strftime(timestamp_format)} - "
-                f"{self.end_timestamp.astimezone(get_localzone()).strftime(timestamp_format)}"
-            )
+            template = f"{start_timestamp} - {end_timestamp}"
         return template
 
 
@@ -476,6 +580,7 @@ class Movie(object):
         self._end_timestamp = None
         self._duration = None
         self._events = {}
+        self._sorted = None
 
     @property
     def filename(self):
@@ -490,6 +595,7 @@ class Movie(object):
 
     def set_event(self, event_info: Event):
         self._events.update({event_info.filename: event_info})
+        self._sorted = None
 
     def item(self, value):
         return self.event(value)
@@ -568,7 +674,12 @@ class Movie(object):
 
     @property
     def sorted(self):
-        return sorted(self._events, key=lambda clip: self._events[clip].start_timestamp)
+        # Sorted list is kept until another event is added.
+        if self._sorted is None:
+            self._sorted = sorted(
+                self._events, key=lambda clip: self._events[clip].start_timestamp
+            )
+        return self._sorted
 
 
 class Font(object):
@@ -1317,6 +1428,44 @@ class Diamond(Cross):
         ) * self.cameras("rear").include
 
 
+MOVIE_LAYOUT = {
+    "WIDESCREEN": WideScreen,
+    "FULLSCREEN": FullScreen,
+    "PERSPECTIVE": FullScreen,
+    "CROSS": Cross,
+    "DIAMOND": Diamond,
+}
+
+
+class TitleScreenMap(staticmap.StaticMap):
+    """Title Screen Map class
+
+    Map tiles are retrieved through 1 session (keeping connection alive) and the most
+    recently used ones are kept, maps for other movies are likely to require the same
+    tiles.
+    """
+
+    _session = None
+    _tiles = OrderedDict()
+
+    def get(self, url, **kwargs):
+        if (tile := TitleScreenMap._tiles.get(url)) is not None:
+            TitleScreenMap._tiles.move_to_end(url)
+            return tile
+
+        if TitleScreenMap._session is None:
+            TitleScreenMap._session = requests.Session()
+
+        response = TitleScreenMap._session.get(url, **kwargs)
+        tile = (response.status_code, response.content)
+        if response.status_code == 200:
+            TitleScreenMap._tiles.update({url: tile})
+            if len(TitleScreenMap._tiles) > TITLE_MAP_TILE_CACHE_SIZE:
+                TitleScreenMap._tiles.popitem(last=False)
+
+        return tile
+
+
 class MyArgumentParser(argparse.ArgumentParser):
     def convert_arg_line_to_args(self, arg_line):
         # Remove comments.
@@ -1332,12 +1481,9 @@ class MyArgumentParser(argparse.ArgumentParser):
             argument_dict = {}
             for argument_value in argument:
                 if "=" in argument_value:
-                    key = argument_value.split("=")[0].lower()
-                    value = (
-                        argument_value.split("=")[1].strip()
-                        if argument_value.split("=")[1].strip() != ""
-                        else None
-                    )
+                    key, _, value = argument_value.partition("=")
+                    key = key.lower()
+                    value = value.split("=")[0].strip() or None
                 else:
                     key = default
                     value = argument_value
@@ -1392,6 +1538,37 @@ def search_dict(
     )
 
 
+@lru_cache(maxsize=128)
+def compile_template(template):
+    """Parses the format string once, returning function to format it with the values provided.
+
+    Only simple variables are handled, for anything else str.format is used. Parsed
+    templates are cached as the merge template is used for every event."""
+    formatter = Formatter()
+    parsed_template = list(formatter.parse(template))
+
+    if any(
+        field_name is not None and (not field_name.isidentifier() or "{" in format_spec)
+        for _, field_name, format_spec, _ in parsed_template
+    ):
+        return lambda values: template.format(**values)
+
+    def format_template(values):
+        formatted = []
+        for literal_text, field_name, format_spec, conversion in parsed_template:
+            formatted.append(literal_text)
+            if field_name is not None:
+                formatted.append(
+                    formatter.format_field(
+                        formatter.convert_field(values[field_name], conversion),
+                        format_spec,
+                    )
+                )
+        return "".join(formatted)
+
+    return format_template
+
+
 def get_current_timestamp():
     """Returns the current timestamp"""
     """Uses ugly global variable, this should die a quick death..."""
@@ -1402,28 +1579,195 @@ def get_current_timestamp():
         return ""
 
 
-def check_latest_release(include_beta):
-    """Checks GitHub for latest release"""
+def get_local_timezone():
+    """Returns the local timezone, determined only once as this can require reading files or registry"""
+    global LOCAL_TIMEZONE
+
+    if LOCAL_TIMEZONE is None:
+        LOCAL_TIMEZONE = get_localzone()
+    return LOCAL_TIMEZONE
+
+
+def parse_timestamp(value):
+    """Returns the datetime for the ISO 8601 string provided, in local time if no
+    timezone was provided.
+
+    datetime.fromisoformat is a lot faster then isoparse but does not accept all ISO
+    formats, only fall back to isoparse if it fails."""
+    try:
+        parsed_timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        parsed_timestamp = isoparse(value)
+
+    if parsed_timestamp.tzinfo is None:
+        parsed_timestamp = parsed_timestamp.astimezone(get_local_timezone())
+    return parsed_timestamp
+
+
+@lru_cache(maxsize=4096)
+def format_timestamp(value, timestamp_format):
+    """Returns the timestamp in local time formatted.
+
+    The end of a clip is the start of the next one, cache the result as the
+    same timestamps are formatted multiple times."""
+    return value.astimezone(get_local_timezone()).strftime(timestamp_format)
+
+
+def check_latest_release(include_beta, use_cache=False):
+    """Checks GitHub for latest release
+
+    If use_cache is set then the release information retrieved by a previous run is
+    used if it is less then RELEASE_CACHE_TIME seconds old. Otherwise GitHub is only
+    asked to return the release information if it changed since the previous run."""
+
+    cache_file = os.path.join(
+        str(Path.home()),
+        RELEASE_CACHE_DIR.get(PLATFORM, ".cache/tesla_dashcam"),
+        "release_test.json" if include_beta else "release.json",
+    )
+    try:
+        cache_age = timestamp() - os.stat(cache_file).st_mtime
+        with open(cache_file, encoding="utf-8") as fp:
+            cache = json.load(fp)
+    except (OSError, ValueError):
+        cache = {}
+
+    if cache.get("release") is not None:
+        if use_cache and cache_age < RELEASE_CACHE_TIME:
+            return cache["release"]
+    else:
+        cache = {}
 
     url = f"{GITHUB['URL']}/repos/{GITHUB['owner']}/{GITHUB['repo']}/releases"
 
+    # Only the latest release is needed when including betas as well.
+    params = {"per_page": 1} if include_beta else None
     if not include_beta:
         url = url + "/latest"
+
+    headers = {"If-None-Match": cache["etag"]} if cache.get("etag") else None
     try:
-        releases = requests.get(url)
+        releases = requests.get(url, params=params, headers=headers)
     except requests.exceptions.RequestException as exc:
         print(f"{get_current_timestamp()}Unable to check for latest release: {exc}")
         return None
 
+    if releases.status_code == 304:
+        # Release information did not change, restart the time it can be re-used.
+        _LOGGER.debug("Latest release information did not change.")
+        try:
+            os.utime(cache_file)
+        except OSError as exc:
+            _LOGGER.debug(f"Unable to update release cache file {cache_file}: {exc}")
+        return cache["release"]
+
     release_data = releases.json()
     # If we include betas then we would have received a list, thus get 1st
     # element as that is the latest release.
     if include_beta:
         release_data = release_data[0]
 
+    if releases.ok:
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, "w", encoding="utf-8") as fp:
+                json.dump(
+                    {"etag": releases.headers.get("ETag"), "release": release_data},
+                    fp,
+                )
+        except OSError as exc:
+            _LOGGER.debug(f"Unable to write release cache file {cache_file}: {exc}")
+
     return release_data
 
 
+def check_for_update(include_beta, check_for_updates, system_notification):
+    """Check if a newer release is available and report it.
+
+    Returns False if the latest release information could not be retrieved.
+    """
+    # Release information from a previous run is only used when not explicitly
+    # checking for an update.
+    release_info = check_latest_release(include_beta, use_cache=not check_for_updates)
+    if release_info is None:
+        print(f"{get_current_timestamp()} Did not retrieve latest version info.")
+        return False
+
+    tag_name = release_info.get("tag_name")
+    prerelease = release_info.get("prerelease")
+    html_url = release_info.get("html_url")
+
+    new_version = False
+    if tag_name is not None:
+        github_version = tag_name.split(".")
+        if len(github_version) == 3:
+            # Release tags normally start with v. If that is the case
+            # then strip the v.
+            try:
+                major_version = int(github_version[0])
+            except ValueError:
+                major_version = int(github_version[0][1:])
+
+            minor_version = int(github_version[1])
+            if prerelease:
+                # Drafts will have b and then beta number.
+                patch_version = int(github_version[2].split("b")[0])
+                beta_version = int(github_version[2].split("b")[1])
+            else:
+                patch_version = int(github_version[2])
+                beta_version = -1
+
+            # A release (beta -1) is newer than any of its betas.
+            new_version = (
+                major_version,
+                minor_version,
+                patch_version,
+                beta_version if beta_version != -1 else float("inf"),
+            ) > (
+                VERSION["major"],
+                VERSION["minor"],
+                VERSION["patch"],
+                VERSION["beta"] if VERSION["beta"] != -1 else float("inf"),
+            )
+
+    if new_version:
+        beta = ""
+        if prerelease:
+            beta = "beta "
+
+        release_notes = ""
+        if not check_for_updates:
+            if system_notification:
+                notify(
+                    "TeslaCam",
+                    "Update available",
+                    f"New {beta}release {tag_name} is available. You are on version "
+                    f"{VERSION_STR}",
+                )
+            release_notes = "Use --check_for_update to get latest " "release notes."
+
+        print(
+            f"{get_current_timestamp()}New {beta}release {tag_name} is available for "
+            f"download ({html_url}). You are currently on {VERSION_STR}. {release_notes}"
+        )
+
+        if check_for_updates:
+            print(
+                f"{get_current_timestamp()}You can download the new release from: "
+                f"{html_url}"
+            )
+            print(
+                f"{get_current_timestamp()}Release Notes:\n {release_info.get('body')}"
+            )
+    else:
+        if check_for_updates:
+            print(
+                f"{get_current_timestamp()}{VERSION_STR} is the latest release available."
+            )
+
+    return True
+
+
 def get_tesladashcam_folder():
     """Check if there is a drive mounted with the Tesla DashCam folder."""
     for partition in disk_partitions(all=False):
@@ -1438,6 +1782,155 @@ def get_tesladashcam_folder():
     return None, None
 
 
+def start_folder_watch(folders):
+    """Start watching the folders for changes.
+
+    Returns an event that is set whenever something changes within one of the folders
+    together with the observer. If watchdog is not installed or none of the folders
+    exist then None is returned for both and monitoring will be done by polling."""
+    folders = [folder for folder in folders if os.path.isdir(folder)]
+    if not folders:
+        return None, None
+
+    try:
+        # Only import watchdog when monitoring, it is not a requirement.
+        # noinspection PyUnresolvedReferences,PyPackageRequirements
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        _LOGGER.debug("Package watchdog is not installed, polling for changes.")
+        return None, None
+
+    changed = threading_Event()
+
+    class ChangeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            changed.set()
+
+    observer = Observer()
+    observer.daemon = True
+    for folder in folders:
+        _LOGGER.debug(f"Watching folder {folder} for changes.")
+        observer.schedule(ChangeHandler(), folder, recursive=False)
+    observer.start()
+    return changed, observer
+
+
+class MountObserver(Thread):
+    """Sets the event whenever a file system is mounted or unmounted."""
+
+    def __init__(self, mountinfo, poller, changed):
+        super().__init__(daemon=True)
+        self._mountinfo = mountinfo
+        self._poller = poller
+        self._changed = changed
+        self._stopped = threading_Event()
+
+    def run(self):
+        try:
+            while not self._stopped.is_set():
+                # Time out regularly to allow stopping.
+                if self._poller.poll(MONITOR_SLEEP_TIME * 1000):
+                    # The mount table has to be read again to be notified of the next change.
+                    self._mountinfo.seek(0)
+                    self._mountinfo.read()
+                    _LOGGER.debug("Mounted file systems changed.")
+                    self._changed.set()
+        finally:
+            self._mountinfo.close()
+
+    def stop(self):
+        self._stopped.set()
+
+
+def start_drive_watch():
+    """Start watching for file systems being mounted or unmounted (Linux only).
+
+    A drive being attached is only usable once it is mounted, the mount table is thus
+    watched instead of the devices. Returns an event that is set whenever the mounts
+    change together with the observer. If the mount table can not be watched then None
+    is returned for both and monitoring will be done by polling."""
+    try:
+        # poll is not available on all platforms.
+        from select import POLLERR, POLLPRI, poll
+
+        mountinfo = open("/proc/self/mountinfo", encoding="utf-8")
+    except (OSError, ImportError) as exc:
+        _LOGGER.debug(f"Unable to watch mounts, polling for drives: {exc}")
+        return None, None
+
+    # Read the current mounts, only changes after this are then reported.
+    mountinfo.read()
+    poller = poll()
+    poller.register(mountinfo, POLLPRI | POLLERR)
+
+    changed = threading_Event()
+    observer = MountObserver(mountinfo, poller, changed)
+    observer.start()
+    return changed, observer
+
+
+def remove_trigger_file(monitor_file):
+    """Remove the trigger file, returns False if it could not be removed."""
+    try:
+        os.remove(monitor_file)
+    except FileNotFoundError:
+        # Already removed.
+        pass
+    except OSError as exc:
+        print(
+            f"{get_current_timestamp()}Error trying to remove trigger file {monitor_file}: {exc}"
+        )
+        return False
+    return True
+
+
+def wait_for_change(changed):
+    """Wait for a change in the watched folders, or MONITOR_SLEEP_TIME if not watching."""
+    if changed is None:
+        sleep(MONITOR_SLEEP_TIME)
+        return
+
+    changed.wait(MONITOR_SLEEP_TIME)
+    changed.clear()
+
+
+def get_folder_clips(ffmpeg, event_folder):
+    """Returns the timestamps of the clips within the folder and the metadata of their
+    camera files, or None if it is not a folder."""
+    if not os.path.isdir(event_folder):
+        return None
+
+    _LOGGER.debug(f"Retrieving all video files in folder {event_folder}.")
+    # Collect the timestamps of the video files within folder, using a dict to keep
+    # them unique while preserving the order.
+    clip_timestamps = {}
+    for clip_filename in glob(os.path.join(event_folder, "*.mp4")):
+        # Get the timestamp of the filename.
+        _, clip_filename_only = os.path.split(clip_filename)
+        clip_timestamps.update({clip_filename_only.rsplit("-", 1)[0]: None})
+
+    # Get meta data for all the camera files within the folder at once to determine creation time and
+    # duration.
+    folder_metadata = {
+        item["filename"]: item
+        for item in get_metadata(
+            ffmpeg,
+            [
+                os.path.join(event_folder, clip_timestamp + camera_file)
+                for clip_timestamp in clip_timestamps
+                for camera_file in [
+                    "-front.mp4",
+                    "-left_repeater.mp4",
+                    "-right_repeater.mp4",
+                    "-back.mp4",
+                ]
+            ],
+        )
+    }
+    return clip_timestamps, folder_metadata
+
+
 def get_movie_files(source_folder, video_settings):
     """Find all the clip files within folder (and subfolder if requested)"""
 
@@ -1460,34 +1953,34 @@ def get_movie_files(source_folder, video_settings):
             else:
                 folder_list.add(pathname)
 
+    layout = video_settings["video_layout"]
     events_list = {}
     # Go through each folder, get the movie files within it and add to movie list.
     # Sorting folder list 1st.
     print(f"{get_current_timestamp()}Scanning {len(folder_list)} folder(s)")
+    sorted_folder_list = sorted(folder_list)
+
+    # Retrieving the metadata is mostly waiting for ffmpeg, hence it is retrieved for
+    # multiple folders at the same time while the folders are processed in order.
+    metadata_executor = ThreadPoolExecutor(max_workers=METADATA_MAX_WORKERS)
+    folder_clips_list = metadata_executor.map(
+        lambda folder: get_folder_clips(video_settings["ffmpeg_exec"], folder),
+        sorted_folder_list,
+    )
+    metadata_executor.shutdown(wait=False)
+
     folders_scanned = 0
-    for event_folder in sorted(folder_list):
+    for event_folder, folder_clips in zip(sorted_folder_list, folder_clips_list):
         if folders_scanned % 10 == 0 and folders_scanned != 0:
             print(f"Scanned {folders_scanned}/{len(folder_list)}.")
         folders_scanned = folders_scanned + 1
 
-        if os.path.isdir(event_folder):
-            _LOGGER.debug(f"Retrieving all video files in folder {event_folder}.")
+        if folder_clips is not None:
             event_info = None
+            clip_timestamps, folder_metadata = folder_clips
 
-            # Collect video files within folder and process.
-            for clip_filename in glob(os.path.join(event_folder, "*.mp4")):
-                # Get the timestamp of the filename.
-                _, clip_filename_only = os.path.split(clip_filename)
-                clip_timestamp = clip_filename_only.rsplit("-", 1)[0]
-
-                # Check if we already processed this timestamp.
-                if (
-                    event_info is not None
-                    and event_info.clip(clip_timestamp) is not None
-                ):
-                    # Already processed this clip, moving on.
-                    continue
-
+            # Process each of the clips.
+            for clip_timestamp in clip_timestamps:
                 front_filename = str(clip_timestamp) + "-front.mp4"
                 front_path = os.path.join(event_folder, front_filename)
 
@@ -1500,11 +1993,12 @@ def get_movie_files(source_folder, video_settings):
                 rear_filename = str(clip_timestamp) + "-back.mp4"
                 rear_path = os.path.join(event_folder, rear_filename)
 
-                # Get meta data for each camera for this timestamp to determine creation time and duration.
-                metadata = get_metadata(
-                    video_settings["ffmpeg_exec"],
-                    [front_path, left_path, right_path, rear_path],
-                )
+                # Get meta data for each camera for this timestamp.
+                metadata = [
+                    folder_metadata[camera_path]
+                    for camera_path in [front_path, left_path, right_path, rear_path]
+                    if camera_path in folder_metadata
+                ]
 
                 # Move on to next one if nothing received.
                 if not metadata:
@@ -1520,22 +2014,22 @@ def get_movie_files(source_folder, video_settings):
                 for item in metadata:
                     _, filename = os.path.split(item["filename"])
                     if filename == front_filename:
-                        if video_settings["video_layout"].swap_front_rear:
+                        if layout.swap_front_rear:
                             camera = "rear"
                         else:
                             camera = "front"
                     elif filename == left_filename:
-                        if video_settings["video_layout"].swap_left_right:
+                        if layout.swap_left_right:
                             camera = "right"
                         else:
                             camera = "left"
                     elif filename == right_filename:
-                        if video_settings["video_layout"].swap_left_right:
+                        if layout.swap_left_right:
                             camera = "left"
                         else:
                             camera = "right"
                     elif filename == rear_filename:
-                        if video_settings["video_layout"].swap_front_rear:
+                        if layout.swap_front_rear:
                             camera = "front"
                         else:
                             camera = "rear"
@@ -1550,7 +2044,7 @@ def get_movie_files(source_folder, video_settings):
                                 clip_timestamp, "%Y-%m-%d_%H-%M"
                             )
                             clip_starting_timestamp = (
-                                clip_starting_timestamp.astimezone(get_localzone())
+                                clip_starting_timestamp.astimezone(get_local_timezone())
                             )
                         else:
                             # This is for version 2019.16 and later
@@ -1571,9 +2065,7 @@ def get_movie_files(source_folder, video_settings):
                             else clip_starting_timestamp
                         ),
                         include=(
-                            item["include"]
-                            if video_settings["video_layout"].cameras(camera).include
-                            else False
+                            item["include"] if layout.cameras(camera).include else False
                         ),
                     )
 
@@ -1704,16 +2196,82 @@ def get_movie_files(source_folder, video_settings):
     return events_list
 
 
+@lru_cache(maxsize=None)
+def get_ffmpeg_encoders(ffmpeg):
+    """Returns the encoders supported by ffmpeg, retrieved only once for ffmpeg."""
+    try:
+        command_result = run(
+            [ffmpeg, "-hide_banner", "-encoders"], capture_output=True, text=True
+        )
+    except OSError as exc:
+        _LOGGER.debug(f"Unable to retrieve encoders from ffmpeg {ffmpeg}: {exc}")
+        return frozenset()
+
+    # Encoders are listed as: <capabilities> <name> <description>
+    encoders = set()
+    for line in command_result.stdout.splitlines():
+        if (encoder := match(r"^ [VAS][A-Z.]{5} (\S+)", line)) is not None:
+            if encoder.group(1) != "=":
+                encoders.add(encoder.group(1))
+
+    _LOGGER.debug(f"ffmpeg {ffmpeg} supports encoders: {sorted(encoders)}")
+    return frozenset(encoders)
+
+
+@lru_cache(maxsize=None)
+def get_render_devices():
+    """Returns the PCI vendor ID of the GPU for each render device (Linux only)."""
+    render_devices = {}
+    for vendor_file in sorted(glob(RENDER_DEVICE_VENDOR_FILES)):
+        try:
+            with open(vendor_file, encoding="utf-8") as fp:
+                vendor = fp.read().strip().lower()
+        except OSError:
+            continue
+
+        # Vendor file is in <render device>/device/vendor
+        device_name = os.path.basename(os.path.dirname(os.path.dirname(vendor_file)))
+        render_devices.update({os.path.join("/dev/dri", device_name): vendor})
+
+    _LOGGER.debug(f"Render devices found: {render_devices}")
+    return render_devices
+
+
+def get_gpu_type(encoding, ffmpeg_encoders):
+    """Returns the first GPU type for which ffmpeg supports the encoder and the
+    hardware is present."""
+    for gpu_type in GPU_TYPE_ORDER:
+        if MOVIE_ENCODING.get(encoding + "_" + gpu_type) not in ffmpeg_encoders:
+            continue
+
+        # ffmpeg builds often include the hardware encoders regardless of the hardware,
+        # only use them if the GPU is confirmed to be there.
+        if gpu_type == "nvidia" and which("nvidia-smi") is None:
+            continue
+
+        if (
+            gpu_type == "intel"
+            and GPU_VENDOR_INTEL not in get_render_devices().values()
+        ):
+            continue
+
+        if (
+            gpu_type == "vaapi"
+            and get_render_devices().get(VAAPI_DEVICE) not in GPU_VENDORS_VAAPI
+        ):
+            continue
+
+        return gpu_type
+
+    return None
+
+
 def get_metadata(ffmpeg, filenames):
     """Retrieve the meta data for the clip (i.e. timestamp, duration)"""
     # Get meta data for each video to determine creation time and duration.
-    ffmpeg_command = [ffmpeg]
-
     metadata = []
     for camera_file in filenames:
         if os.path.isfile(camera_file):
-            ffmpeg_command.append("-i")
-            ffmpeg_command.append(camera_file)
             metadata.append(
                 {
                     "filename": camera_file,
@@ -1725,9 +2283,32 @@ def get_metadata(ffmpeg, filenames):
         else:
             _LOGGER.debug(f"File {camera_file} does not exist, skipping.")
 
-    # Don't run ffmpeg if nothing to check for.
-    if not metadata:
-        return metadata
+    # Multiple files are provided to ffmpeg at once. ffmpeg stops at the 1st file it
+    # is unable to open (i.e. corrupt file), that file is kept as not to be included
+    # and ffmpeg is run again for the files after it.
+    metadata_remaining = metadata
+    while metadata_remaining:
+        metadata_batch = metadata_remaining[:METADATA_BATCH_SIZE]
+        input_counter = _get_metadata_batch(ffmpeg, metadata_batch)
+        if input_counter < len(metadata_batch):
+            _LOGGER.debug(
+                f"Unable to retrieve metadata for file "
+                f"{metadata_batch[input_counter]['filename']}"
+            )
+            input_counter += 1
+        metadata_remaining = metadata_remaining[input_counter:]
+
+    return metadata
+
+
+def _get_metadata_batch(ffmpeg, metadata):
+    """Retrieve the meta data for the files in the list with 1 ffmpeg run.
+
+    Returns the number of files ffmpeg was able to open."""
+    ffmpeg_command = [ffmpeg]
+    for metadata_item in metadata:
+        ffmpeg_command.append("-i")
+        ffmpeg_command.append(metadata_item["filename"])
 
     ffmpeg_command.append("-hide_banner")
 
@@ -1739,7 +2320,7 @@ def get_metadata(ffmpeg, filenames):
     wait_for_input_line = True
     metadata_item = {}
     for line in command_result.stderr.splitlines():
-        if search("^Input #", line) is not None:
+        if line.startswith("Input #"):
             # If filename was not yet appended then it means it is a corrupt file, in that case just add to list for
             # but identify not to include for processing
             metadata_item = next(metadata_iterator)
@@ -1752,14 +2333,16 @@ def get_metadata(ffmpeg, filenames):
         if wait_for_input_line:
             continue
 
-        if search("^ *creation_time ", line) is not None:
+        # Metadata lines are indented, plain string checks are enough to find them.
+        line_start = line.lstrip()
+        if line_start.startswith("creation_time "):
             line_split = line.split(":", 1)
             video_timestamp = datetime.strptime(
                 line_split[1].strip(), "%Y-%m-%dT%H:%M:%S.%f%z"
             )
             continue
 
-        if search("^ *Duration: ", line) is not None:
+        if line_start.startswith("Duration: "):
             line_split = line.split(",")
             line_split = line_split[0].split(":", 1)
             duration_list = line_split[1].split(":")
@@ -1784,11 +2367,88 @@ def get_metadata(ffmpeg, filenames):
 
             wait_for_input_line = True
 
-    return metadata
+    return input_counter
+
+
+def _run_ffmpeg(ffmpeg_command):
+    """Run ffmpeg, reading its output line by line.
+
+    Only the last lines of the output are kept. Returns the return code and
+    the kept output."""
+    output_lines = deque(maxlen=FFMPEG_OUTPUT_LINES)
+    # No input is provided to ffmpeg, otherwise ffmpeg processes running at the same
+    # time all compete for the terminal.
+    with Popen(
+        ffmpeg_command,
+        stdin=DEVNULL,
+        stdout=DEVNULL,
+        stderr=PIPE,
+        universal_newlines=True,
+    ) as ffmpeg_process:
+        for line in ffmpeg_process.stderr:
+            output_lines.append(line)
+
+    return ffmpeg_process.returncode, "".join(output_lines)
+
+
+def get_created_duration(ffmpeg, filename, duration):
+    """Returns the duration of the created file.
+
+    The duration is calculated from what was provided to ffmpeg, the file is only
+    probed if it could not be calculated."""
+    if duration is not None:
+        return duration
+
+    _LOGGER.debug(f"Duration of {filename} is not known, retrieving metadata.")
+    metadata = get_metadata(ffmpeg, [filename])
+    return metadata[0]["duration"] if metadata else None
+
+
+@lru_cache(maxsize=256)
+def format_duration_filter(filter_template, duration, speed=""):
+    """Returns filter with duration (and speed) filled in.
+
+    Most clips have the same duration, thus the result is cached."""
+    return filter_template.format(duration=duration, speed=speed)
+
+
+def format_creation_time(value):
+    """Returns the timestamp in UTC as used for the creation_time metadata."""
+    return strftime("%Y-%m-%dT%H:%M:%S.000000Z", gmtime(int(value.timestamp())))
+
+
+def get_event_replacements(event_info: Event, user_timestamp_format):
+    """Returns the text overlay replacement values that are the same for all clips
+
+    of an event together with the epoch timestamp of the event (if any)."""
+    event_epoch_timestamp = None
+    event_replacements = {
+        "event_timestamp_countdown": "n/a",
+        "event_timestamp_countdown_rolling": "n/a",
+        "event_timestamp": "n/a",
+        "event_city": event_info.metadata.get("city") or "n/a",
+        "event_reason": event_info.metadata.get("reason") or "n/a",
+        "event_latitude": event_info.metadata.get("latitude") or 0.0,
+        "event_longitude": event_info.metadata.get("longitude") or 0.0,
+    }
+
+    if event_info.metadata.get("event_timestamp") is not None:
+        event_epoch_timestamp = int(event_info.metadata["event_timestamp"].timestamp())
+        event_replacements["event_timestamp"] = format_timestamp(
+            event_info.metadata["event_timestamp"], user_timestamp_format
+        )
+
+    return event_epoch_timestamp, event_replacements
 
 
 def create_intermediate_movie(
-    event_info: Event, clip_info: Clip, folder_timestamps, video_settings, clip_number
+    event_info: Event,
+    clip_info: Clip,
+    folder_timestamps,
+    video_settings,
+    clip_number,
+    event_epoch_timestamp,
+    event_replacements,
 ):
     """Create intermediate movie files. This is the merging of the 3 camera
 
@@ -1805,7 +2465,7 @@ def create_intermediate_movie(
     if len(clip_filenames) == 0:
         _LOGGER.debug(
             f"No valid front, left, right, and rear camera clip exist for "
-            f'{clip_info.timestamp.astimezone(get_localzone()).strftime("%Y-%m-%dT%H-%M-%S")}'
+            f"{format_timestamp(clip_info.timestamp, FILENAME_TIMESTAMP_FORMAT)}"
         )
         return True
 
@@ -1866,64 +2526,64 @@ def create_intermediate_movie(
 
     ffmpeg_camera_commands = []
     ffmpeg_camera_filters = []
-    _exclude = object()
+    missing_cameras = set()
     for camera in video_settings["video_layout"].clip_order:
-        if clip_filename := clip_filenames.get(camera, _exclude):
-            # If camera is not in dictionary then it is excluded.
-            if clip_filename is not _exclude:
-                # Got a valid clip for this camera and to be included
-                ffmpeg_camera_commands.append(
-                    ffmpeg_offset_command + ["-i", clip_filename]
-                )
-                ffmpeg_camera_filters.append(
-                    ";["
-                    + str(len(ffmpeg_camera_commands) - 1)
-                    + ":v] "
-                    + video_settings["cameras"][camera]
-                )
+        clip_filename = clip_filenames.get(camera)
+        if clip_filename is not None:
+            # Got a valid clip for this camera and to be included
+            ffmpeg_camera_commands.append(
+                video_settings["ffmpeg_hwdecode"]
+                + ffmpeg_offset_command
+                + ["-i", clip_filename]
+            )
+            ffmpeg_camera_filters.append(
+                ";["
+                + str(len(ffmpeg_camera_commands) - 1)
+                + ":v] "
+                + video_settings["cameras"][camera]
+            )
+        elif not video_settings["video_layout"].cameras(camera).include:
+            # Camera is excluded from the video.
+            continue
+        elif camera in video_settings["skip_cameras"]:
+            # No clip for this camera, nothing has to be put on top of the background.
+            missing_cameras.add(camera)
         else:
+            # Background for this camera is pre-built, only duration is clip specific.
             ffmpeg_camera_filters.append(
-                video_settings["background"].format(
-                    duration=clip_duration,
-                    speed=video_settings["movie_speed"],
-                    width=video_settings["video_layout"].cameras(camera).width,
-                    height=video_settings["video_layout"].cameras(camera).height,
+                format_duration_filter(
+                    video_settings["camera_background"][camera], clip_duration
                 )
-                + f"[{camera}]"
             )
 
-    local_timestamp = clip_info.timestamp.astimezone(get_localzone())
+    clip_positions = "".join(
+        skip_position if camera in missing_cameras else position
+        for camera, position, skip_position in video_settings["clip_positions"]
+    )
+
+    clip_movie_name = (
+        format_timestamp(clip_info.timestamp, FILENAME_TIMESTAMP_FORMAT) + ".mp4"
+    )
+    clip_local_timestamp = format_timestamp(clip_info.timestamp, "%x %X")
 
     # Check if target video file exist if skip existing.
     file_already_exist = False
     if video_settings["skip_existing"]:
-        temp_movie_name = (
-            os.path.join(
-                video_settings["target_folder"],
-                local_timestamp.strftime("%Y-%m-%dT%H-%M-%S"),
-            )
-            + ".mp4"
-        )
-        if os.path.isfile(temp_movie_name):
+        temp_movie_name = os.path.join(video_settings["target_folder"], clip_movie_name)
+        if clip_movie_name in video_settings["existing_target_files"]:
             file_already_exist = True
         elif (
             not video_settings["keep_intermediate"]
             and video_settings["temp_dir"] is not None
         ):
-            temp_movie_name = (
-                os.path.join(
-                    video_settings["temp_dir"],
-                    local_timestamp.strftime("%Y-%m-%dT%H-%M-%S"),
-                )
-                + ".mp4"
-            )
-            if os.path.isfile(temp_movie_name):
+            temp_movie_name = os.path.join(video_settings["temp_dir"], clip_movie_name)
+            if clip_movie_name in video_settings["existing_temp_files"]:
                 file_already_exist = True
 
         if file_already_exist:
             print(
                 f"{get_current_timestamp()}\t\tSkipping clip {clip_number + 1}/{event_info.count} from "
-                f"{local_timestamp.strftime('%x %X')} and {int(clip_duration)} seconds as it already exist."
+                f"{clip_local_timestamp} and {int(clip_duration)} seconds as it already exist."
             )
             clip_info.filename = temp_movie_name
             clip_info.start_timestamp = starting_timestamp
@@ -1940,48 +2600,28 @@ def create_intermediate_movie(
             and video_settings["temp_dir"] is not None
             else video_settings["target_folder"]
         )
-        temp_movie_name = os.path.join(
-            target_folder, local_timestamp.strftime("%Y-%m-%dT%H-%M-%S") + ".mp4"
-        )
+        temp_movie_name = os.path.join(target_folder, clip_movie_name)
 
     print(
         f"{get_current_timestamp()}\t\tProcessing clip {clip_number + 1}/{event_info.count} from "
-        f"{local_timestamp.strftime('%x %X')} and {int(clip_duration)} seconds long."
+        f"{clip_local_timestamp} and {int(clip_duration)} seconds long."
     )
 
     starting_epoch_timestamp = int(starting_timestamp.timestamp())
 
     ffmpeg_text = video_settings["ffmpeg_text_overlay"]
-    user_formatted_text = video_settings["text_overlay_format"]
     user_timestamp_format = video_settings["timestamp_format"]
     ffmpeg_user_timestamp_format = user_timestamp_format.replace(":", "\\\:")
 
-    # Replace variables in user provided text overlay
+    # Replace variables in user provided text overlay, event values are the same for all clips.
     replacement_strings = {
-        "start_timestamp": starting_timestamp.astimezone(get_localzone()).strftime(
-            user_timestamp_format
-        ),
-        "end_timestamp": ending_timestamp.astimezone(get_localzone()).strftime(
-            user_timestamp_format
-        ),
+        **event_replacements,
+        "start_timestamp": format_timestamp(starting_timestamp, user_timestamp_format),
+        "end_timestamp": format_timestamp(ending_timestamp, user_timestamp_format),
         "local_timestamp_rolling": f"%{{pts:localtime:{starting_epoch_timestamp}:{ffmpeg_user_timestamp_format}}}",
-        "event_timestamp_countdown": "n/a",
-        "event_timestamp_countdown_rolling": "n/a",
-        "event_timestamp": "n/a",
-        "event_city": "n/a",
-        "event_reason": "n/a",
-        "event_latitude": 0.0,
-        "event_longitude": 0.0,
     }
 
-    if event_info.metadata.get("event_timestamp") is not None:
-        event_epoch_timestamp = int(event_info.metadata["event_timestamp"].timestamp())
-        replacement_strings["event_timestamp"] = (
-            event_info.metadata["event_timestamp"]
-            .astimezone(get_localzone())
-            .strftime(user_timestamp_format)
-        )
-
+    if event_epoch_timestamp is not None:
         # Calculate the time until the event
         replacement_strings["event_timestamp_countdown"] = (
             starting_epoch_timestamp - event_epoch_timestamp
@@ -1992,14 +2632,11 @@ def create_intermediate_movie(
             event_timestamp_countdown=replacement_strings["event_timestamp_countdown"]
         )
 
-    replacement_strings["event_city"] = event_info.metadata.get("city") or "n/a"
-    replacement_strings["event_reason"] = event_info.metadata.get("reason") or "n/a"
-    replacement_strings["event_latitude"] = event_info.metadata.get("latitude") or 0.0
-    replacement_strings["event_longitude"] = event_info.metadata.get("longitude") or 0.0
-
     try:
         # Try to replace strings!
-        user_formatted_text = user_formatted_text.format(**replacement_strings)
+        user_formatted_text = video_settings["text_overlay_template"](
+            replacement_strings
+        )
     except KeyError as e:
         user_formatted_text = "Bad string format: Invalid variable {stderr}".format(
             stderr=str(e)
@@ -2007,26 +2644,28 @@ def create_intermediate_movie(
         _LOGGER.warning(user_formatted_text)
 
     # Escape characters ffmpeg needs
-    user_formatted_text = user_formatted_text.replace(":", "\:")
-    user_formatted_text = user_formatted_text.replace("\\n", os.linesep)
-
-    ffmpeg_text = ffmpeg_text.replace("__USERTEXT__", user_formatted_text)
-
-    ffmpeg_filter = video_settings["base"].format(
-        duration=clip_duration, speed=video_settings["movie_speed"]
+    user_formatted_text = user_formatted_text.translate(FFMPEG_TEXT_ESCAPE).replace(
+        "\\n", os.linesep
     )
 
-    # Add the respective camera filters.
-    for ffmpeg_camera_filter in ffmpeg_camera_filters:
-        ffmpeg_filter += ffmpeg_camera_filter
+    ffmpeg_text = ffmpeg_text.replace("__USERTEXT__", user_formatted_text)
 
-    ffmpeg_filter += (
-        video_settings["clip_positions"]
-        + ffmpeg_text
-        + video_settings["ffmpeg_speed"]
-        + video_settings["ffmpeg_motiononly"]
-        + video_settings["ffmpeg_hwupload"]
-    )
+    # Base, followed by the respective camera filters and then all the others.
+    # Without a base the filters start with the separator of the 1st camera filter,
+    # which is removed.
+    ffmpeg_filter = "".join(
+        [
+            format_duration_filter(
+                video_settings["base"], clip_duration, video_settings["movie_speed"]
+            ),
+            *ffmpeg_camera_filters,
+            clip_positions,
+            ffmpeg_text,
+            video_settings["ffmpeg_speed"],
+            video_settings["ffmpeg_motiononly"],
+            video_settings["ffmpeg_hwupload"],
+        ]
+    ).lstrip(";")
 
     title_timestamp = (
         replacement_strings["event_timestamp"]
@@ -2042,7 +2681,7 @@ def create_intermediate_movie(
 
     ffmpeg_metadata = [
         "-metadata",
-        f"creation_time={starting_timestamp.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000000Z')}",
+        f"creation_time={format_creation_time(starting_timestamp)}",
         "-metadata",
         f"description=Created by tesla_dashcam {VERSION_STR}",
         "-metadata",
@@ -2052,6 +2691,7 @@ def create_intermediate_movie(
     ffmpeg_command = (
         [video_settings["ffmpeg_exec"]]
         + ["-loglevel", "info"]
+        + video_settings["ffmpeg_filter_threads"]
         + video_settings["ffmpeg_hwdev"]
         + video_settings["ffmpeg_hwout"]
     )
@@ -2059,39 +2699,66 @@ def create_intermediate_movie(
     for ffmpeg_camera_command in ffmpeg_camera_commands:
         ffmpeg_command += ffmpeg_camera_command
 
+    # Write out the filter to a file, this keeps the command line short as the
+    # filter can become quite long.
+    ffmpeg_filter_filehandle, ffmpeg_filter_filename = mkstemp(suffix=".txt", text=True)
+    with os.fdopen(ffmpeg_filter_filehandle, "w", encoding="utf-8", newline="") as fp:
+        fp.write(ffmpeg_filter)
+
+    _LOGGER.debug("Filter file contains:\n%s", ffmpeg_filter)
+
     ffmpeg_command += (
-        ["-filter_complex", ffmpeg_filter]
+        ["-filter_complex_script", ffmpeg_filter_filename]
         + ["-map", f"[{video_settings['input_clip']}]"]
         + video_settings["other_params"]
         + ffmpeg_metadata
     )
 
+    # The camera clips can start at different times making the output as long as the
+    # longest one, the output is limited to the duration of the clip so that the
+    # duration of the created file is known.
+    # Frames are dropped when only keeping motion, the duration is then unknown.
+    created_duration = None
+    if not video_settings["ffmpeg_motiononly"]:
+        created_duration = clip_duration * (video_settings["movie_speed"] or 1)
+        ffmpeg_command += ["-t", str(created_duration)]
+
     ffmpeg_command = ffmpeg_command + ["-y", temp_movie_name]
     _LOGGER.debug(f"FFMPEG Command: {ffmpeg_command}")
     print(f"FFMPEG Command: {ffmpeg_command}")
     # Run the command.
     try:
-        ffmpeg_output = run(
-            ffmpeg_command, capture_output=True, check=True, universal_newlines=True
-        )
-    except CalledProcessError as exc:
+        ffmpeg_rc, ffmpeg_output = _run_ffmpeg(ffmpeg_command)
+    finally:
+        # Remove temp filter file.
+        # noinspection PyBroadException,PyPep8
+        try:
+            os.remove(ffmpeg_filter_filename)
+        except:
+            _LOGGER.debug(f"Failed to remove {ffmpeg_filter_filename}")
+            pass
+
+    if ffmpeg_rc != 0:
         print(
             f"{get_current_timestamp()}\t\t\tError trying to create clip for "
-            f"{os.path.join(event_info.folder, local_timestamp.strftime('%Y-%m-%dT%H-%M-%S') + '.mp4')}."
-            f"RC: {exc.returncode}\n"
-            f"{get_current_timestamp()}\t\t\tCommand: {exc.cmd}\n"
-            f"{get_current_timestamp()}\t\t\tError: {exc.stderr}\n\n"
+            f"{os.path.join(event_info.folder, clip_movie_name)}."
+            f"RC: {ffmpeg_rc}\n"
+            f"{get_current_timestamp()}\t\t\tCommand: {ffmpeg_command}\n"
+            f"{get_current_timestamp()}\t\t\tError: {ffmpeg_output}\n\n"
         )
         return False
-    _LOGGER.debug("FFMPEG output:\n %s", ffmpeg_output.stdout)
-    _LOGGER.debug("FFMPEG error output:\n %s", ffmpeg_output.stderr)
+
+    _LOGGER.debug("FFMPEG output:\n %s", ffmpeg_output)
 
     clip_info.filename = temp_movie_name
     clip_info.start_timestamp = starting_timestamp
     clip_info.end_timestamp = ending_timestamp
     # Get actual duration of our new video, required for chapters when concatenating.
-    metadata = get_metadata(video_settings["ffmpeg_exec"], [temp_movie_name])
-    clip_info.duration = metadata[0]["duration"] if metadata else None
+    clip_info.duration = get_created_duration(
+        video_settings["ffmpeg_exec"], temp_movie_name, created_duration
+    )
+    # Same clip can be part of another event processed later on.
+    update_existing_files(video_settings, [temp_movie_name], True)
 
     return True
 
@@ -2103,7 +2770,7 @@ def create_title_screen(events, video_settings):
         _LOGGER.debug("No events provided to create map for.")
         return None
 
-    m = staticmap.StaticMap(
+    m = TitleScreenMap(
         video_settings["video_layout"].video_width,
         video_settings["video_layout"].video_height,
     )
@@ -2157,6 +2824,13 @@ def create_title_screen(events, video_settings):
     return image
 
 
+def get_concat_path(path):
+    """Returns path as required within the ffmpeg concat file.
+
+    Windows paths need forward slashes, nothing to replace on other platforms."""
+    return path.replace(os.sep, "/") if os.sep != "/" else path
+
+
 def create_movie(
     movie, event_info, movie_filename, video_settings, chapter_offset, title_screen_map
 ):
@@ -2166,348 +2840,314 @@ def create_movie(
         _LOGGER.debug(f"Movie list is empty")
         return True
 
-    title_video_filename = None
-    if title_screen_map:
-        title_image = create_title_screen(
-            events=event_info, video_settings=video_settings
-        )
+    # All temporary files (title, join and meta) are created within a temporary
+    # folder that is removed together with its content once done.
+    with TemporaryDirectory() as temp_folder:
+        title_video_filename = None
+        if title_screen_map:
+            title_image = create_title_screen(
+                events=event_info, video_settings=video_settings
+            )
 
-        title_image_filename = None
-        if title_image is not None:
-            _, title_image_filename = mkstemp(suffix=".png", text=False)
+            title_image_filename = None
+            if title_image is not None:
+                title_image_filename = os.path.join(temp_folder, "title.png")
 
-            try:
-                title_image.save(title_image_filename)
-            except (ValueError, OSError) as exc:
-                print(
-                    f"{get_current_timestamp()}\t\t\tError trying to save title image. RC: {str(exc)}"
+                try:
+                    title_image.save(title_image_filename)
+                except (ValueError, OSError) as exc:
+                    print(
+                        f"{get_current_timestamp()}\t\t\tError trying to save title image. RC: {str(exc)}"
+                    )
+                    title_image_filename = None
+                else:
+                    _LOGGER.debug(f"Title image saved to {title_image_filename}")
+
+            if title_image_filename is not None:
+                title_video_filename = os.path.join(temp_folder, "title.mp4")
+                _LOGGER.debug(
+                    f"Creating movie for title image to {title_video_filename}"
                 )
-                title_image_filename = None
-            else:
-                _LOGGER.debug(f"Title image saved to {title_image_filename}")
-
-        if title_image_filename is not None:
-            _, title_video_filename = mkstemp(suffix=".mp4", text=False)
-            _LOGGER.debug(f"Creating movie for title image to {title_video_filename}")
-            ffmpeg_params = [
-                "-loop",
-                "1",
-                "-framerate",
-                # "1/3",
-                str(video_settings["fps"]),
-                "-t",
-                "3",
-                "-i",
-                title_image_filename,
-                "-vf",
-                f"fps={video_settings['fps']},"
-                f"scale={video_settings['video_layout'].video_width}x{video_settings['video_layout'].video_height}",
-                #                "-pix_fmt",
-                #                "yuv420p",
-            ]
+                ffmpeg_params = [
+                    "-loop",
+                    "1",
+                    "-framerate",
+                    # "1/3",
+                    str(video_settings["fps"]),
+                    "-t",
+                    "3",
+                    "-i",
+                    title_image_filename,
+                    "-vf",
+                    f"fps={video_settings['fps']},"
+                    f"scale={video_settings['video_layout'].video_width}x{video_settings['video_layout'].video_height}",
+                    #                "-pix_fmt",
+                    #                "yuv420p",
+                ]
 
-            ffmpeg_command = (
-                [video_settings["ffmpeg_exec"]]
-                + ["-loglevel", "info"]
-                + video_settings["ffmpeg_hwdev"]
-                + video_settings["ffmpeg_hwout"]
-                + ffmpeg_params
-                + video_settings["other_params"]
-            )
+                ffmpeg_command = (
+                    [video_settings["ffmpeg_exec"]]
+                    + ["-loglevel", "info"]
+                    + video_settings["ffmpeg_hwdev"]
+                    + video_settings["ffmpeg_hwout"]
+                    + ffmpeg_params
+                    + video_settings["other_params"]
+                )
 
-            ffmpeg_command = ffmpeg_command + ["-y", title_video_filename]
+                ffmpeg_command = ffmpeg_command + ["-y", title_video_filename]
 
-            _LOGGER.debug(f"FFMPEG Command: {ffmpeg_command}")
-            try:
-                ffmpeg_output = run(
-                    ffmpeg_command,
-                    capture_output=True,
-                    check=True,
-                    universal_newlines=True,
-                )
-            except CalledProcessError as exc:
+                _LOGGER.debug(f"FFMPEG Command: {ffmpeg_command}")
+                ffmpeg_rc, ffmpeg_output = _run_ffmpeg(ffmpeg_command)
+                if ffmpeg_rc != 0:
+                    print(
+                        f"{get_current_timestamp()}\t\t\tError trying to create title clip. RC: {ffmpeg_rc}\n"
+                        f"{get_current_timestamp()}\t\t\tCommand: {ffmpeg_command}\n"
+                        f"{get_current_timestamp()}\t\t\tError: {ffmpeg_output}\n\n"
+                    )
+                    title_video_filename = None
+                else:
+                    _LOGGER.debug("FFMPEG output:\n %s", ffmpeg_output)
+
+        # Go through the list of clips to create the command and content for chapter meta file.
+        total_clips = 0
+        meta_parts = [";FFMETADATA1" + os.linesep]
+        file_parts = []
+        meta_start = 0
+        total_videoduration = 0
+        start_timestamp = None
+        end_timestamp = None
+        chapter_offset = chapter_offset * 1000000000
+
+        if title_video_filename:
+            file_parts.append(
+                f"file 'file:{get_concat_path(title_video_filename)}'{os.linesep}"
+            )
+            total_videoduration += 3 * 1000000000
+            meta_start += 3 * 1000000000 + 1
+
+        # Loop through the list sorted by video timestamp.
+        for movie_item in movie.sorted:
+            video_clip = movie.item(movie_item)
+            # Check that this item was included for processing or not.
+            if video_clip.filename is None:
+                continue
+
+            if not os.path.isfile(video_clip.filename):
                 print(
-                    f"{get_current_timestamp()}\t\t\tError trying to create title clip. RC: {exc.returncode}\n"
-                    f"{get_current_timestamp()}\t\t\tCommand: {exc.cmd}\n"
-                    f"{get_current_timestamp()}\t\t\tError: {exc.stderr}\n\n"
+                    f"{get_current_timestamp()}\t\tFile {video_clip.filename} does not exist anymore, skipping."
                 )
-                title_video_filename = None
-
-                # Now remove the title image
-                try:
-                    os.remove(title_image_filename)
-                except:
-                    _LOGGER.debug(f"Failed to remove {title_image_filename}")
-                    pass
-            else:
-                _LOGGER.debug("FFMPEG output:\n %s", ffmpeg_output.stdout)
-                _LOGGER.debug("FFMPEG error output:\n %s", ffmpeg_output.stderr)
-
-    # Go through the list of clips to create the command and content for chapter meta file.
-    total_clips = 0
-    meta_content = ""
-    file_content = ""
-    meta_start = 0
-    total_videoduration = 0
-    start_timestamp = None
-    end_timestamp = None
-    chapter_offset = chapter_offset * 1000000000
-
-    if title_video_filename:
-        file_content = (
-            f"file 'file:{title_video_filename.replace(os.sep, '/')}'{os.linesep}"
-        )
-        total_videoduration += 3 * 1000000000
-        meta_start += 3 * 1000000000 + 1
-
-    # Loop through the list sorted by video timestamp.
-    for movie_item in movie.sorted:
-        video_clip = movie.item(movie_item)
-        # Check that this item was included for processing or not.
-        if video_clip.filename is None:
-            continue
-
-        if not os.path.isfile(video_clip.filename):
-            print(
-                f"{get_current_timestamp()}\t\tFile {video_clip.filename} does not exist anymore, skipping."
+                continue
+            _LOGGER.debug(
+                f"Video file {video_clip.filename} will be added to "
+                f"{movie_filename}"
             )
-            continue
-        _LOGGER.debug(
-            f"Video file {video_clip.filename} will be added to " f"{movie_filename}"
-        )
-        # Add this file in our join list.
-        # NOTE: Recent ffmpeg changes requires Windows paths in this file to look like
-        # file 'file:<actual path>'
-        # https://trac.ffmpeg.org/ticket/2702
-        file_content = (
-            file_content
-            + f"file 'file:{video_clip.filename.replace(os.sep, '/')}'{os.linesep}"
-        )
-        total_clips = total_clips + 1
-        title = video_clip.start_timestamp.astimezone(get_localzone())
-        # For duration need to also calculate if video was sped-up or slowed down.
-        video_duration = int(video_clip.duration * 1000000000)
-        total_videoduration += video_duration
-        chapter_start = meta_start
-        if video_duration > abs(chapter_offset):
-            if chapter_offset < 0:
-                chapter_start = meta_start + video_duration + chapter_offset
-            elif chapter_offset > 0:
-                chapter_start = chapter_start + chapter_offset
-
-        # We need to add an initial chapter if our "1st" chapter is not at the beginning of the movie.
-        if total_clips == 1 and chapter_start > 0:
-            meta_content = (
-                "[CHAPTER]{linesep}"
-                "TIMEBASE=1/1000000000{linesep}"
-                "START={start}{linesep}"
-                "END={end}{linesep}"
-                "title={title}{linesep}".format(
-                    linesep=os.linesep, start=0, end=chapter_start - 1, title="Start"
-                )
+            # Add this file in our join list.
+            # NOTE: Recent ffmpeg changes requires Windows paths in this file to look like
+            # file 'file:<actual path>'
+            # https://trac.ffmpeg.org/ticket/2702
+            file_parts.append(
+                f"file 'file:{get_concat_path(video_clip.filename)}'{os.linesep}"
             )
+            total_clips = total_clips + 1
+            # For duration need to also calculate if video was sped-up or slowed down.
+            video_duration = int(video_clip.duration * 1000000000)
+            total_videoduration += video_duration
+            chapter_start = meta_start
+            if video_duration > abs(chapter_offset):
+                if chapter_offset < 0:
+                    chapter_start = meta_start + video_duration + chapter_offset
+                elif chapter_offset > 0:
+                    chapter_start = chapter_start + chapter_offset
+
+            # We need to add an initial chapter if our "1st" chapter is not at the beginning of the movie.
+            if total_clips == 1 and chapter_start > 0:
+                meta_parts.append(
+                    "[CHAPTER]{linesep}"
+                    "TIMEBASE=1/1000000000{linesep}"
+                    "START={start}{linesep}"
+                    "END={end}{linesep}"
+                    "title={title}{linesep}".format(
+                        linesep=os.linesep,
+                        start=0,
+                        end=chapter_start - 1,
+                        title="Start",
+                    )
+                )
 
-        meta_content = (
-            meta_content + f"[CHAPTER]{os.linesep}"
-            f"TIMEBASE=1/1000000000{os.linesep}"
-            f"START={chapter_start}{os.linesep}"
-            f"END={meta_start + video_duration}{os.linesep}"
-            f"title={title.strftime(video_settings['timestamp_format'])}{os.linesep}"
-        )
-        meta_start = meta_start + 1 + video_duration
-
-        if start_timestamp is None:
-            start_timestamp = video_clip.start_timestamp
-        else:
-            start_timestamp = (
-                video_clip.start_timestamp
-                if start_timestamp > video_clip.start_timestamp
-                else start_timestamp
+            meta_parts.append(
+                f"[CHAPTER]{os.linesep}"
+                f"TIMEBASE=1/1000000000{os.linesep}"
+                f"START={chapter_start}{os.linesep}"
+                f"END={meta_start + video_duration}{os.linesep}"
+                f"title={format_timestamp(video_clip.start_timestamp, video_settings['timestamp_format'])}{os.linesep}"
             )
+            meta_start = meta_start + 1 + video_duration
 
-        if end_timestamp is None:
-            end_timestamp = video_clip.end_timestamp
-        else:
-            end_timestamp = (
-                video_clip.end_timestamp
-                if end_timestamp < video_clip.end_timestamp
-                else end_timestamp
-            )
+            if start_timestamp is None:
+                start_timestamp = video_clip.start_timestamp
+            else:
+                start_timestamp = (
+                    video_clip.start_timestamp
+                    if start_timestamp > video_clip.start_timestamp
+                    else start_timestamp
+                )
 
-    if total_clips == 0:
-        print(f"{get_current_timestamp()}\t\tError: No valid clips to merge found.")
-        return True
+            if end_timestamp is None:
+                end_timestamp = video_clip.end_timestamp
+            else:
+                end_timestamp = (
+                    video_clip.end_timestamp
+                    if end_timestamp < video_clip.end_timestamp
+                    else end_timestamp
+                )
 
-    # Write out the video files file
-    ffmpeg_join_filehandle, ffmpeg_join_filename = mkstemp(suffix=".txt", text=True)
-    with os.fdopen(ffmpeg_join_filehandle, "w") as fp:
-        fp.write(file_content)
-
-    _LOGGER.debug("Video file contains:\n%s", file_content)
-    # Write out the meta data file.
-    meta_content = ";FFMETADATA1" + os.linesep + meta_content
-
-    ffmpeg_meta_filehandle, ffmpeg_meta_filename = mkstemp(suffix=".txt", text=True)
-    with os.fdopen(ffmpeg_meta_filehandle, "w") as fp:
-        fp.write(meta_content)
-
-    _LOGGER.debug("Meta file contains:\n%s", meta_content)
-
-    ffmpeg_params = [
-        "-f",
-        "concat",
-        "-safe",
-        "0",
-        "-i",
-        ffmpeg_join_filename,
-        "-i",
-        ffmpeg_meta_filename,
-        "-map_metadata",
-        "1",
-        "-map_chapters",
-        "1",
-    ]
-    if video_settings["movflags_faststart"]:
-        ffmpeg_params = ffmpeg_params + ["-movflags", "+faststart"]
+        if total_clips == 0:
+            print(f"{get_current_timestamp()}\t\tError: No valid clips to merge found.")
+            return True
 
-    ffmpeg_params = ffmpeg_params + ["-c", "copy"]
-    user_timestamp_format = video_settings["timestamp_format"]
-    if len(event_info) == 1:
-        title_timestamp = (
-            event_info[0]
-            .metadata["event_timestamp"]
-            .astimezone(get_localzone())
-            .strftime(user_timestamp_format)
-            if event_info[0].metadata.get("reason") == "SENTRY"
-            and event_info[0].metadata.get("event_timestamp") is not None
-            else start_timestamp.astimezone(get_localzone()).strftime(
-                user_timestamp_format
+        file_content = "".join(file_parts)
+        meta_content = "".join(meta_parts)
+
+        # Write out the video files file
+        ffmpeg_join_filename = os.path.join(temp_folder, "join.txt")
+        with open(ffmpeg_join_filename, "w") as fp:
+            fp.write(file_content)
+
+        _LOGGER.debug("Video file contains:\n%s", file_content)
+        # Write out the meta data file.
+        ffmpeg_meta_filename = os.path.join(temp_folder, "meta.txt")
+        with open(ffmpeg_meta_filename, "w") as fp:
+            fp.write(meta_content)
+
+        _LOGGER.debug("Meta file contains:\n%s", meta_content)
+
+        ffmpeg_params = [
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-i",
+            ffmpeg_join_filename,
+            "-i",
+            ffmpeg_meta_filename,
+            "-map_metadata",
+            "1",
+            "-map_chapters",
+            "1",
+        ]
+        if video_settings["movflags_faststart"]:
+            ffmpeg_params += ["-movflags", "+faststart"]
+
+        ffmpeg_params += ["-c", "copy"]
+        user_timestamp_format = video_settings["timestamp_format"]
+        if len(event_info) == 1:
+            title_timestamp = start_timestamp
+            if (
+                event_info[0].metadata.get("reason") == "SENTRY"
+                and event_info[0].metadata.get("event_timestamp") is not None
+            ):
+                title_timestamp = event_info[0].metadata["event_timestamp"]
+            title_timestamp = format_timestamp(title_timestamp, user_timestamp_format)
+            title = f"{event_info[0].metadata.get('reason', title_timestamp) or title_timestamp}: {title_timestamp}"
+        else:
+            title = (
+                f"{format_timestamp(start_timestamp, user_timestamp_format)} - "
+                f"{format_timestamp(end_timestamp, user_timestamp_format)}"
             )
-        )
-        title = f"{event_info[0].metadata.get('reason', title_timestamp) or title_timestamp}: {title_timestamp}"
-    else:
-        title = (
-            f"{start_timestamp.astimezone(get_localzone()).strftime(user_timestamp_format)} - "
-            f"{end_timestamp.astimezone(get_localzone()).strftime(user_timestamp_format)}"
-        )
-
-    ffmpeg_metadata = [
-        "-metadata",
-        f"creation_time={start_timestamp.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000000Z')}",
-        "-metadata",
-        f"description=Created by tesla_dashcam {VERSION_STR}",
-        "-metadata",
-        f"title={title}",
-    ]
 
-    # Go through the events and add the 1st valid coordinations for location to metadata
-    for event in event_info:
+        ffmpeg_metadata = [
+            "-metadata",
+            f"creation_time={format_creation_time(start_timestamp)}",
+            "-metadata",
+            f"description=Created by tesla_dashcam {VERSION_STR}",
+            "-metadata",
+            f"title={title}",
+        ]
 
-        if (
-            event.metadata.get("longitude") is None
-            or event.metadata.get("latitude") is None
-        ):
-            continue
+        # Go through the events and add the 1st valid coordinations for location to metadata
+        for event in event_info:
 
-        try:
-            lon = float(event.metadata["longitude"])
-            lat = float(event.metadata["latitude"])
-        except:
-            pass
-        else:
-            # Sometimes event info has a very small (i.e. 2.35754e-311) or 0 value, we ignore if both are 0.
-            # 0,0 is in the ocean near Africa.
-            if round(lon, 5) == 0 and round(lat, 5) == 0:
-                _LOGGER.debug(
-                    f"Skipping as longitude {lon} and/or latidude {lat} are invalid."
-                )
+            if (
+                event.metadata.get("longitude") is None
+                or event.metadata.get("latitude") is None
+            ):
                 continue
 
-            location = f"{lat:+.4f}{lon:+.4f}"
-            ffmpeg_metadata.extend(
-                [
-                    "-metadata",
-                    f"location={location}",
-                    "-metadata",
-                    f"location-eng={location}",
-                ]
-            )
-            break
+            try:
+                lon = float(event.metadata["longitude"])
+                lat = float(event.metadata["latitude"])
+            except:
+                pass
+            else:
+                # Sometimes event info has a very small (i.e. 2.35754e-311) or 0 value, we ignore if both are 0.
+                # 0,0 is in the ocean near Africa.
+                if round(lon, 5) == 0 and round(lat, 5) == 0:
+                    _LOGGER.debug(
+                        f"Skipping as longitude {lon} and/or latidude {lat} are invalid."
+                    )
+                    continue
 
-    ffmpeg_command = (
-        [video_settings["ffmpeg_exec"]]
-        + ["-loglevel", "info"]
-        + ffmpeg_params
-        + ffmpeg_metadata
-        + ["-y", movie_filename]
-    )
+                location = f"{lat:+.4f}{lon:+.4f}"
+                ffmpeg_metadata.extend(
+                    [
+                        "-metadata",
+                        f"location={location}",
+                        "-metadata",
+                        f"location-eng={location}",
+                    ]
+                )
+                break
 
-    _LOGGER.debug(f"FFMPEG Command: {ffmpeg_command}")
-    try:
-        ffmpeg_output = run(
-            ffmpeg_command, capture_output=True, check=True, universal_newlines=True
-        )
-    except CalledProcessError as exc:
-        print(
-            f"{get_current_timestamp()}\t\t\tError trying to create movie {movie_filename}. RC: {exc.returncode}\n"
-            f"{get_current_timestamp()}\t\t\tCommand: {exc.cmd}\n"
-            f"{get_current_timestamp()}\t\t\tError: {exc.stderr}\n\n"
+        ffmpeg_command = (
+            [video_settings["ffmpeg_exec"]]
+            + ["-loglevel", "info"]
+            + ffmpeg_params
+            + ffmpeg_metadata
+            + ["-y", movie_filename]
         )
-    else:
-        _LOGGER.debug("FFMPEG output:\n %s", ffmpeg_output.stdout)
-        _LOGGER.debug("FFMPEG error output:\n %s", ffmpeg_output.stderr)
-        # Get actual duration of our new video, required for chapters when concatenating.
-        metadata = get_metadata(video_settings["ffmpeg_exec"], [movie_filename])
-        movie.duration = metadata[0]["duration"] if metadata else None
-        movie.filename = movie_filename
-        movie.start_timestamp = start_timestamp
-        movie.end_timestamp = end_timestamp
-
-        # Set the file timestamp if to be set based on timestamp event
-        if video_settings["set_moviefile_timestamp"] != "RENDER":
-            moviefile_timestamp = start_timestamp.astimezone(get_localzone())
-            if video_settings["set_moviefile_timestamp"] == "STOP":
-                moviefile_timestamp = end_timestamp.astimezone(get_localzone())
-            elif (
-                video_settings["set_moviefile_timestamp"] == "SENTRY"
-                and len(event_info) == 1
-                and event_info[0].metadata.get("timestamp") is not None
-            ):
-                moviefile_timestamp = (
-                    event_info[0].metadata["timestamp"].astimezone(get_localzone())
-                )
 
-            _LOGGER.debug(
-                f"Setting timestamp for movie file {movie_filename} to "
-                f"{moviefile_timestamp.strftime('%Y-%m-%dT%H-%M-%S')}"
+        _LOGGER.debug(f"FFMPEG Command: {ffmpeg_command}")
+        ffmpeg_rc, ffmpeg_output = _run_ffmpeg(ffmpeg_command)
+        if ffmpeg_rc != 0:
+            print(
+                f"{get_current_timestamp()}\t\t\tError trying to create movie {movie_filename}. RC: {ffmpeg_rc}\n"
+                f"{get_current_timestamp()}\t\t\tCommand: {ffmpeg_command}\n"
+                f"{get_current_timestamp()}\t\t\tError: {ffmpeg_output}\n\n"
             )
-            moviefile_timestamp = mktime(moviefile_timestamp.timetuple())
-            os.utime(movie_filename, (moviefile_timestamp, moviefile_timestamp))
-
-    # Remove temp join file.
-    # noinspection PyBroadException,PyPep8
-    try:
-        os.remove(ffmpeg_join_filename)
-    except:
-        _LOGGER.debug(f"Failed to remove {ffmpeg_join_filename}")
-        pass
-
-    # Remove temp join file.
-    # noinspection PyBroadException,PyPep8
-    try:
-        os.remove(ffmpeg_meta_filename)
-    except:
-        _LOGGER.debug(f"Failed to remove {ffmpeg_meta_filename}")
-        pass
+        else:
+            _LOGGER.debug("FFMPEG output:\n %s", ffmpeg_output)
+            # Get actual duration of our new video, required for chapters when concatenating.
+            movie.duration = get_created_duration(
+                video_settings["ffmpeg_exec"],
+                movie_filename,
+                total_videoduration / 1000000000,
+            )
+            movie.filename = movie_filename
+            movie.start_timestamp = start_timestamp
+            movie.end_timestamp = end_timestamp
+
+            # Set the file timestamp if to be set based on timestamp event
+            if video_settings["set_moviefile_timestamp"] != "RENDER":
+                moviefile_timestamp = start_timestamp.astimezone(get_local_timezone())
+                if video_settings["set_moviefile_timestamp"] == "STOP":
+                    moviefile_timestamp = end_timestamp.astimezone(get_local_timezone())
+                elif (
+                    video_settings["set_moviefile_timestamp"] == "SENTRY"
+                    and len(event_info) == 1
+                    and event_info[0].metadata.get("timestamp") is not None
+                ):
+                    moviefile_timestamp = (
+                        event_info[0]
+                        .metadata["timestamp"]
+                        .astimezone(get_local_timezone())
+                    )
 
-    # Remove image video
-    if title_video_filename:
-        # noinspection PyBroadException,PyPep8
-        try:
-            os.remove(title_video_filename)
-        except:
-            _LOGGER.debug(f"Failed to remove {title_video_filename}")
-            pass
+                _LOGGER.debug(
+                    f"Setting timestamp for movie file {movie_filename} to "
+                    f"{format_timestamp(moviefile_timestamp, FILENAME_TIMESTAMP_FORMAT)}"
+                )
+                moviefile_timestamp = mktime(moviefile_timestamp.timetuple())
+                os.utime(movie_filename, (moviefile_timestamp, moviefile_timestamp))
 
     if movie.filename is None:
         return False
@@ -2515,6 +3155,11 @@ def create_movie(
     return True
 
 
+def get_absolute_path(path):
+    """Returns the absolute path with variables and user home expanded."""
+    return os.path.abspath(os.path.expanduser(os.path.expandvars(path)))
+
+
 def make_folder(parameter, folder):
     # Create folder if not already existing.
     try:
@@ -2560,6 +3205,189 @@ def delete_intermediate(movie_files):
                     )
 
 
+def get_sidecar_filename(movie_filename):
+    """Returns the name of the sidecar file for the movie file."""
+    return os.path.splitext(movie_filename)[0] + MOVIE_SIDECAR_EXTENSION
+
+
+def write_movie_sidecar(movie_filename, duration, file_stat=None):
+    """Store the duration of the movie file in its sidecar file."""
+    sidecar_filename = get_sidecar_filename(movie_filename)
+    try:
+        if file_stat is None:
+            file_stat = os.stat(movie_filename)
+        with open(sidecar_filename, "w", encoding="utf-8") as fp:
+            json.dump(
+                {
+                    "mtime": file_stat.st_mtime_ns,
+                    "size": file_stat.st_size,
+                    "duration": duration,
+                },
+                fp,
+            )
+    except OSError as exc:
+        _LOGGER.debug(f"Unable to write sidecar file {sidecar_filename}: {exc}")
+
+
+def get_movie_durations(ffmpeg, movie_files):
+    """Returns the durations of existing movie files.
+
+    The duration is stored in a sidecar file next to each movie file and only
+    retrieved from the movie files that were changed, all with 1 metadata call."""
+    durations = {}
+    sidecars = {}
+    for filename, file_stat in movie_files:
+        sidecar_filename = get_sidecar_filename(filename)
+        try:
+            with open(sidecar_filename, encoding="utf-8") as fp:
+                sidecar = json.load(fp)
+        except (OSError, ValueError):
+            sidecar = {}
+
+        if (
+            sidecar.get("mtime") == file_stat.st_mtime_ns
+            and sidecar.get("size") == file_stat.st_size
+            and sidecar.get("duration") is not None
+        ):
+            durations.update({filename: sidecar["duration"]})
+        else:
+            sidecars.update({filename: file_stat})
+
+    if not sidecars:
+        return durations
+
+    for metadata_item in get_metadata(ffmpeg, list(sidecars)):
+        filename = metadata_item["filename"]
+        durations.update({filename: metadata_item["duration"]})
+        if metadata_item["include"]:
+            write_movie_sidecar(filename, metadata_item["duration"], sidecars[filename])
+
+    return durations
+
+
+def get_folder_files(folder):
+    """Returns the names of the files within the folder."""
+    if folder is None:
+        return set()
+
+    try:
+        with os.scandir(folder) as folder_entries:
+            return {entry.name for entry in folder_entries if entry.is_file()}
+    except OSError as exc:
+        _LOGGER.debug(f"Unable to retrieve files from folder {folder}: {exc}")
+        return set()
+
+
+def update_existing_files(video_settings, filenames, exists):
+    """Update the existing files retrieved for --skip_existing with the intermediate
+    files created or removed during this run."""
+    if not video_settings["skip_existing"]:
+        return
+
+    target_folder = os.path.normpath(video_settings["target_folder"])
+    with video_settings["existing_files_lock"]:
+        for filename in filenames:
+            folder, name = os.path.split(filename)
+            existing_files = (
+                video_settings["existing_target_files"]
+                if os.path.normpath(folder) == target_folder
+                else video_settings["existing_temp_files"]
+            )
+            if exists:
+                existing_files.add(name)
+            else:
+                existing_files.discard(name)
+
+
+def create_event_movie(
+    event_folder,
+    event_info,
+    event_movie_filename,
+    clip_results,
+    movies,
+    video_settings,
+    delete_source,
+    delete_executor,
+):
+    """Create the movie for the event once all its clips have been processed."""
+    delete_folder_clips = []
+    delete_folder_files = delete_source
+    delete_file_list = []
+    # Camera filenames are relative to the event folder.
+    event_folder_prefix = os.path.join(event_folder, "")
+
+    for clip_info, clip_result in clip_results:
+        if clip_result.result():
+
+            if clip_info.filename != event_info.filename:
+                delete_folder_clips.append(clip_info.filename)
+
+            # Add the files to our list for removal.
+            for _, camera_info in clip_info.cameras:
+                delete_file_list.append(event_folder_prefix + camera_info.filename)
+        else:
+            delete_folder_files = False
+
+    # All clips for the event  have been processed, merge those clips
+    # together now.
+    print(
+        f"{get_current_timestamp()}\t\tCreating movie {event_movie_filename}, please be patient."
+    )
+
+    if create_movie(
+        event_info,
+        [event_info],
+        event_movie_filename,
+        video_settings,
+        0,
+        video_settings["video_layout"].title_screen_map,
+    ):
+        movie_filename = event_info.filename
+        if movie_filename is not None:
+            key = event_info.template(
+                video_settings["merge_group_template"],
+                video_settings["merge_timestamp_format"],
+                video_settings,
+            )
+            movies.setdefault(key, Movie()).set_event(event_info)
+
+            # Store the duration so it does not have to be retrieved from the movie
+            # when it is skipped on a next run.
+            write_movie_sidecar(movie_filename, event_info.duration)
+
+            print(
+                f"{get_current_timestamp()}\tMovie {movie_filename} for folder {event_folder} with "
+                f"duration {str(timedelta(seconds=int(event_info.duration)))} is ready."
+            )
+
+            # Delete the intermediate files we created.
+            if not video_settings["keep_intermediate"]:
+                _LOGGER.debug(f"Deleting {len(delete_folder_clips)} intermediate files")
+                delete_intermediate(delete_folder_clips)
+                update_existing_files(video_settings, delete_folder_clips, False)
+    else:
+        delete_folder_files = False
+
+    # Delete the source files if stated to delete.
+    # We only do so if there were no issues in processing the clips
+    if delete_folder_files:
+        print(
+            f"{get_current_timestamp()}\t\tDeleting {len(delete_file_list) + 2} files and folder {event_folder}"
+        )
+        # Delete the files, the metadata (event.json) and picture (thumb.png) files,
+        # and then the folder. This is done in the background while continuing with
+        # the next event.
+        delete_executor.submit(
+            delete_intermediate,
+            delete_file_list
+            + [
+                event_folder_prefix + "event.json",
+                event_folder_prefix + "thumb.png",
+                event_folder,
+            ],
+        )
+
+
 def process_folders(source_folders, video_settings, delete_source):
     """Process all clips found within folders."""
 
@@ -2572,17 +3400,48 @@ def process_folders(source_folders, video_settings, delete_source):
 
     start_time = timestamp()
 
-    total_clips = 0
-    for _, (event_folder, event_info) in enumerate(event_list.items()):
-        total_clips = total_clips + event_info.count
+    total_events = len(event_list)
+    total_clips = sum(event_info.count for event_info in event_list.values())
     print(
-        f"{get_current_timestamp()}There are {len(event_list)} event folder(s) with {total_clips} clips to process."
+        f"{get_current_timestamp()}There are {total_events} event folder(s) with {total_clips} clips to process."
     )
 
+    # Retrieve the existing files once instead of checking for each clip if it was
+    # already created.
+    if video_settings["skip_existing"]:
+        video_settings.update(
+            {
+                "existing_target_files": get_folder_files(
+                    video_settings["target_folder"]
+                ),
+                "existing_temp_files": get_folder_files(video_settings["temp_dir"]),
+                # Clips are created in parallel, all updating the existing files.
+                "existing_files_lock": Lock(),
+            }
+        )
+
+    # Debug messages below are only created when they will be logged.
+    debug_enabled = _LOGGER.isEnabledFor(logging.DEBUG)
+
     # Loop through all the events (folders) sorted.
     movies = {}
+    skipped_events = []
+
+    # Clips of all events are encoded using the same pool.
+    executor = ThreadPoolExecutor(max_workers=video_settings["parallel"])
+    delete_executor = ThreadPoolExecutor(max_workers=DELETE_MAX_WORKERS)
+    # When clips are encoded in parallel the clips of the next event are already
+    # started while the event before it is finishing, otherwise each event is
+    # finished before the next one is started.
+    max_pending_events = 1 if video_settings["parallel"] > 1 else 0
+    pending_events = []
     merge_group_template = video_settings["merge_group_template"]
     timestamp_format = video_settings["merge_timestamp_format"]
+    user_timestamp_format = video_settings["timestamp_format"]
+    target_folder = video_settings["target_folder"]
+    skip_existing = video_settings["skip_existing"]
+    filter_start_timestamp = video_settings["start_timestamp"]
+    filter_end_timestamp = video_settings["end_timestamp"]
 
     for event_count, event_folder in enumerate(sorted(event_list)):
         event_info = event_list.get(event_folder)
@@ -2594,24 +3453,21 @@ def process_folders(source_folders, video_settings, delete_source):
 
         # Skip this folder if we it does not fall within provided timestamps.
         if (
-            video_settings["start_timestamp"] is not None
-            and last_clip_tmstp < video_settings["start_timestamp"]
+            filter_start_timestamp is not None
+            and last_clip_tmstp < filter_start_timestamp
         ):
             # Clips from this folder are from before start timestamp requested.
             _LOGGER.debug(
                 f"Clips in folder end at {last_clip_tmstp} which is still before "
-                f'start timestamp {video_settings["start_timestamp"]}'
+                f"start timestamp {filter_start_timestamp}"
             )
             continue
 
-        if (
-            video_settings["end_timestamp"] is not None
-            and first_clip_tmstp > video_settings["end_timestamp"]
-        ):
+        if filter_end_timestamp is not None and first_clip_tmstp > filter_end_timestamp:
             # Clips from this folder are from after end timestamp requested.
             _LOGGER.debug(
                 f"Clips in folder start at {first_clip_tmstp} which is after "
-                f'end timestamp {video_settings["end_timestamp"]}'
+                f"end timestamp {filter_end_timestamp}"
             )
             continue
 
@@ -2620,15 +3476,13 @@ def process_folders(source_folders, video_settings, delete_source):
             key = event_info.template(
                 merge_group_template, timestamp_format, video_settings
             )
-            if movies.get(key) is None:
-                movies.update({key: Movie()})
-
-            movies.get(key).set_event(event_info)
+            movies.setdefault(key, Movie()).set_event(event_info)
             continue
 
-        _LOGGER.debug(
-            f"Processing event with start timestamp {first_clip_tmstp} and end timestamp {last_clip_tmstp}"
-        )
+        if debug_enabled:
+            _LOGGER.debug(
+                f"Processing event with start timestamp {first_clip_tmstp} and end timestamp {last_clip_tmstp}"
+            )
 
         # Determine the starting and ending timestamps for the clips in this folder based on start/end timestamps
         # provided and offsets.
@@ -2655,9 +3509,10 @@ def process_folders(source_folders, video_settings, delete_source):
                 end_offset = video_settings["sentry_end_offset"]
                 offset_start_timestamp = event_info.metadata["event_timestamp"]
                 offset_end_timestamp = event_info.metadata["event_timestamp"]
-                _LOGGER.debug(
-                    f"Offsets based on sentry event with sentry start offset {start_offset}, sentry end offset {end_offset} and sentry event timestamp {offset_start_timestamp}"
-                )
+                if debug_enabled:
+                    _LOGGER.debug(
+                        f"Offsets based on sentry event with sentry start offset {start_offset}, sentry end offset {end_offset} and sentry event timestamp {offset_start_timestamp}"
+                    )
             elif video_settings["sentry_offset"]:
                 # Otherwise, was it set to use
                 # with the --sentry_offset legacy parameter?
@@ -2665,9 +3520,10 @@ def process_folders(source_folders, video_settings, delete_source):
                 end_offset = video_settings["end_offset"] or 30
                 offset_start_timestamp = event_info.metadata["event_timestamp"]
                 offset_end_timestamp = event_info.metadata["event_timestamp"]
-                _LOGGER.debug(
-                    f"Offsets for sentry event based on standard offsets with start offset {start_offset}, end offset {end_offset} and sentry event timestamp {offset_start_timestamp}"
-                )
+                if debug_enabled:
+                    _LOGGER.debug(
+                        f"Offsets for sentry event based on standard offsets with start offset {start_offset}, end offset {end_offset} and sentry event timestamp {offset_start_timestamp}"
+                    )
 
         # Do we not yet have a start_offset but --start_offset was provided?
         if start_offset is None and video_settings["start_offset"] is not None:
@@ -2677,9 +3533,10 @@ def process_folders(source_folders, video_settings, delete_source):
             offset_start_timestamp = (
                 first_clip_tmstp if start_offset >= 0 else last_clip_tmstp
             )
-            _LOGGER.debug(
-                f"Starting offset {start_offset} and timestamp {offset_start_timestamp}"
-            )
+            if debug_enabled:
+                _LOGGER.debug(
+                    f"Starting offset {start_offset} and timestamp {offset_start_timestamp}"
+                )
 
         # Do we not yet have a start_offset but --start_offset was provided?
         if end_offset is None and video_settings["end_offset"] is not None:
@@ -2689,9 +3546,10 @@ def process_folders(source_folders, video_settings, delete_source):
             offset_end_timestamp = (
                 first_clip_tmstp if end_offset >= 0 else last_clip_tmstp
             )
-            _LOGGER.debug(
-                f"Ending offset {end_offset} and timestamp {offset_end_timestamp}"
-            )
+            if debug_enabled:
+                _LOGGER.debug(
+                    f"Ending offset {end_offset} and timestamp {offset_end_timestamp}"
+                )
 
         event_start_timestamp = (
             offset_start_timestamp + timedelta(seconds=start_offset)
@@ -2704,13 +3562,13 @@ def process_folders(source_folders, video_settings, delete_source):
             else last_clip_tmstp
         )
 
-        if event_start_timestamp != first_clip_tmstp:
+        if debug_enabled and event_start_timestamp != first_clip_tmstp:
             _LOGGER.debug(
                 f"Clip starting timestamp changed to {event_start_timestamp} "
                 f"from {first_clip_tmstp} due to start offset {start_offset} and offset timestamp {offset_start_timestamp}"
             )
 
-        if event_end_timestamp != last_clip_tmstp:
+        if debug_enabled and event_end_timestamp != last_clip_tmstp:
             _LOGGER.debug(
                 f"Clip ending timestamp changed to {event_end_timestamp} "
                 f"from {last_clip_tmstp} due to end offset {end_offset} and offset timestamp {offset_end_timestamp}"
@@ -2719,11 +3577,12 @@ def process_folders(source_folders, video_settings, delete_source):
         # Make sure that our event start timestamp is not after our end timestamp
         if event_start_timestamp > event_end_timestamp:
             # Start timestamp is greater then end timestamp, we'll switch them
-            _LOGGER.debug(
-                f"Clip start timestamp {event_start_timestamp} "
-                f" was after clip end timestamp {event_end_timestamp} "
-                ", swapping them."
-            )
+            if debug_enabled:
+                _LOGGER.debug(
+                    f"Clip start timestamp {event_start_timestamp} "
+                    f" was after clip end timestamp {event_end_timestamp} "
+                    ", swapping them."
+                )
             event_start_timestamp, event_end_timestamp = (
                 event_end_timestamp,
                 event_start_timestamp,
@@ -2735,10 +3594,11 @@ def process_folders(source_folders, video_settings, delete_source):
             # Event start timestamp is either before clip start timestamp or after clip end timestamp
             # Setting it back to clip start timestamp
             event_start_timestamp = first_clip_tmstp
-            _LOGGER.debug(
-                f"Clip start timestamp changed back to {first_clip_tmstp} as "
-                f"updated offset timestamp was before clip start timestamp or after clip end timestamp"
-            )
+            if debug_enabled:
+                _LOGGER.debug(
+                    f"Clip start timestamp changed back to {first_clip_tmstp} as "
+                    f"updated offset timestamp was before clip start timestamp or after clip end timestamp"
+                )
 
         # Make sure that our event end timestamp is equal to or after
         # our clip start timestamp and before our event end timestamp.
@@ -2746,149 +3606,147 @@ def process_folders(source_folders, video_settings, delete_source):
             # Event end timestamp is either before clip start timestamp or after clip end timestamp
             # Setting it back to clip end timestamp
             event_end_timestamp = last_clip_tmstp
-            _LOGGER.debug(
-                f"Clip end timestamp changed back to {last_clip_tmstp} as "
-                f"updated offset timestamp was before clip start timestamp or after clip end timestamp"
-            )
+            if debug_enabled:
+                _LOGGER.debug(
+                    f"Clip end timestamp changed back to {last_clip_tmstp} as "
+                    f"updated offset timestamp was before clip start timestamp or after clip end timestamp"
+                )
 
         # Put them together to create the filename for the folder.
         event_movie_filename = (
-            event_start_timestamp.astimezone(get_localzone()).strftime(
-                "%Y-%m-%dT%H-%M-%S"
-            )
+            format_timestamp(event_start_timestamp, FILENAME_TIMESTAMP_FORMAT)
             + "_"
-            + event_end_timestamp.astimezone(get_localzone()).strftime(
-                "%Y-%m-%dT%H-%M-%S"
-            )
+            + format_timestamp(event_end_timestamp, FILENAME_TIMESTAMP_FORMAT)
         )
 
         # Now add full path to it.
         event_movie_filename = (
-            os.path.join(video_settings["target_folder"], event_movie_filename) + ".mp4"
+            os.path.join(target_folder, event_movie_filename) + ".mp4"
         )
 
         # Do not process the files from this folder if we're to skip it if
         # the target movie file already exist.
-        if video_settings["skip_existing"] and os.path.isfile(event_movie_filename):
+        event_movie_stat = None
+        if skip_existing:
+            try:
+                event_movie_stat = os.stat(event_movie_filename)
+            except OSError:
+                pass
+
+        if event_movie_stat is not None and S_ISREG(event_movie_stat.st_mode):
             print(
                 f"{get_current_timestamp()}\tSkipping folder {event_folder} as {event_movie_filename} is already "
-                f"created ({event_count + 1}/{len(event_list)})"
+                f"created ({event_count + 1}/{total_events})"
             )
 
-            # Get actual duration of our new video, required for chapters when concatenating.
-            metadata = get_metadata(
-                video_settings["ffmpeg_exec"], [event_movie_filename]
-            )
-            event_info.duration = metadata[0]["duration"] if metadata else None
+            # Actual duration of the movie is required for chapters when concatenating,
+            # it is retrieved for all skipped events at once.
+            skipped_events.append((event_info, event_movie_stat))
             event_info.filename = event_movie_filename
             event_info.start_timestamp = event_start_timestamp
             event_info.end_timestamp = event_end_timestamp
             key = event_info.template(
                 merge_group_template, timestamp_format, video_settings
             )
-            if movies.get(key) is None:
-                movies.update({key: Movie()})
-
-            movies.get(key).set_event(event_info)
+            movies.setdefault(key, Movie()).set_event(event_info)
             continue
 
         print(
             f"{get_current_timestamp()}\tProcessing {event_info.count} clips in folder {event_folder} "
-            f"({event_count + 1}/{len(event_list)})"
+            f"({event_count + 1}/{total_events})"
         )
 
-        # Loop through all the clips within the event.
-        delete_folder_clips = []
-        delete_folder_files = delete_source
-        delete_file_list = []
+        # The same clip can be part of multiple events (i.e. RecentClips and SavedClips),
+        # the event with clips in progress is finished first if that is the case as
+        # they would be using the same intermediate files.
+        clip_names = {
+            format_timestamp(
+                event_info.clip(clip_timestamp).timestamp, FILENAME_TIMESTAMP_FORMAT
+            )
+            for clip_timestamp in event_info.sorted
+        }
+        while pending_events and not pending_events[0][1].isdisjoint(clip_names):
+            create_event_movie(
+                *pending_events.pop(0)[0],
+                movies,
+                video_settings,
+                delete_source,
+                delete_executor,
+            )
 
+        # Clips are independent of each other, each is encoded by its own ffmpeg process
+        # allowing multiple to run at the same time. Clips of the next event can thus
+        # already be encoded while the clips of the previous event are finishing.
+        event_epoch_timestamp, event_replacements = get_event_replacements(
+            event_info, user_timestamp_format
+        )
+        clip_results = []
         for clip_number, clip_timestamp in enumerate(event_info.sorted):
             clip_info = event_info.clip(clip_timestamp)
+            clip_results.append(
+                (
+                    clip_info,
+                    executor.submit(
+                        create_intermediate_movie,
+                        event_info,
+                        clip_info,
+                        (event_start_timestamp, event_end_timestamp),
+                        video_settings,
+                        clip_number,
+                        event_epoch_timestamp,
+                        event_replacements,
+                    ),
+                )
+            )
 
-            if create_intermediate_movie(
-                event_info,
-                clip_info,
-                (event_start_timestamp, event_end_timestamp),
-                video_settings,
-                clip_number,
-            ):
-
-                if clip_info.filename != event_info.filename:
-                    delete_folder_clips.append(clip_info.filename)
-
-                # Add the files to our list for removal.
-                for _, camera_info in clip_info.cameras:
-                    delete_file_list.append(
-                        os.path.join(event_folder, camera_info.filename)
-                    )
-            else:
-                delete_folder_files = False
-
-        # All clips for the event  have been processed, merge those clips
-        # together now.
-        print(
-            f"{get_current_timestamp()}\t\tCreating movie {event_movie_filename}, please be patient."
+        pending_events.append(
+            ((event_folder, event_info, event_movie_filename, clip_results), clip_names)
         )
 
-        if create_movie(
-            event_info,
-            [event_info],
-            event_movie_filename,
-            video_settings,
-            0,
-            video_settings["video_layout"].title_screen_map,
+        # Finish the events for which all clips are done or when there are more events
+        # in progress than allowed.
+        while pending_events and (
+            len(pending_events) > max_pending_events
+            or all(clip_result.done() for _, clip_result in pending_events[0][0][3])
         ):
-            if event_info.filename is not None:
-                key = event_info.template(
-                    merge_group_template, timestamp_format, video_settings
-                )
-                if movies.get(key) is None:
-                    movies.update({key: Movie()})
-
-                movies.get(key).set_event(event_info)
-
-                print(
-                    f"{get_current_timestamp()}\tMovie {event_info.filename} for folder {event_folder} with "
-                    f"duration {str(timedelta(seconds=int(event_info.duration)))} is ready."
-                )
-
-                # Delete the intermediate files we created.
-                if not video_settings["keep_intermediate"]:
-                    _LOGGER.debug(
-                        f"Deleting {len(delete_folder_clips)} intermediate files"
-                    )
-                    delete_intermediate(delete_folder_clips)
-        else:
-            delete_folder_files = False
-
-        # Delete the source files if stated to delete.
-        # We only do so if there were no issues in processing the clips
-        if delete_folder_files:
-            print(
-                f"{get_current_timestamp()}\t\tDeleting {len(delete_file_list) + 2} files and folder {event_folder}"
-            )
-            delete_intermediate(delete_file_list)
-            # Delete the metadata (event.json) and picture (thumb.png) files.
-            delete_intermediate(
-                [
-                    os.path.join(event_folder, "event.json"),
-                    os.path.join(event_folder, "thumb.png"),
-                ]
+            create_event_movie(
+                *pending_events.pop(0)[0],
+                movies,
+                video_settings,
+                delete_source,
+                delete_executor,
             )
 
-            # And delete the folder
-            delete_intermediate([event_folder])
+    for pending_event, _ in pending_events:
+        create_event_movie(
+            *pending_event, movies, video_settings, delete_source, delete_executor
+        )
+    executor.shutdown()
+    delete_executor.shutdown()
+
+    # Retrieve the durations of the movies for the events that were skipped.
+    if skipped_events:
+        movie_durations = get_movie_durations(
+            video_settings["ffmpeg_exec"],
+            [
+                (event_info.filename, event_movie_stat)
+                for event_info, event_movie_stat in skipped_events
+            ],
+        )
+        for event_info, _ in skipped_events:
+            event_info.duration = movie_durations.get(event_info.filename)
 
     # Now that we have gone through all the folders merge.
     # We only do this if merge is enabled OR if we only have 1 movie with 1 event clip and for
     # output a specific filename was provided not matching the filename for the event clip
     movies_list = None
     if movies:
+        first_movie = next(iter(movies.values()))
         if video_settings["merge_subdirs"] or (
             video_settings["target_filename"] is not None
             and len(movies) == 1
-            and len(list(movies.values())[0].items) == 1
-            and list(movies.values())[0].first_item.filename
+            and len(first_movie.items) == 1
+            and first_movie.first_item.filename
             != os.path.join(
                 video_settings["target_folder"], video_settings["target_filename"]
             )
@@ -2906,7 +3764,8 @@ def process_folders(source_folders, video_settings, delete_source):
                     f"{video_settings['movie_filename']}."
                 )
 
-            for movie in sorted(movies.keys()):
+            for movie in sorted(movies):
+                movie_info = movies[movie]
                 if merge_group_template is not None and merge_group_template != "":
                     movie_filename = movie + ".mp4"
                 else:
@@ -2926,23 +3785,23 @@ def process_folders(source_folders, video_settings, delete_source):
                 # Only set title screen map if requested and # of events for this movie is greater then 1
                 title_screen_map = (
                     video_settings["video_layout"].title_screen_map
-                    and movies.get(movie).count > 1
+                    and movie_info.count > 1
                 )
 
                 if create_movie(
-                    movies.get(movie),
-                    movies.get(movie).items_sorted,
+                    movie_info,
+                    movie_info.items_sorted,
                     movie_filename,
                     video_settings,
                     video_settings["chapter_offset"],
                     title_screen_map,
                 ):
 
-                    if movies.get(movie).filename is not None:
+                    if movie_info.filename is not None:
                         movies_list.append(
                             (
-                                movies.get(movie).filename,
-                                str(timedelta(seconds=int(movies.get(movie).duration))),
+                                movie_filename,
+                                str(timedelta(seconds=int(movie_info.duration))),
                             )
                         )
 
@@ -2950,20 +3809,32 @@ def process_folders(source_folders, video_settings, delete_source):
                         if not video_settings["merge_subdirs"]:
                             _LOGGER.debug(
                                 f"Deleting "
-                                f"{list(movies.values())[0].first_item.filename} event file"
+                                f"{first_movie.first_item.filename} event file"
                             )
                             delete_intermediate(
-                                [list(movies.values())[0].first_item.filename]
+                                [
+                                    first_movie.first_item.filename,
+                                    get_sidecar_filename(
+                                        first_movie.first_item.filename
+                                    ),
+                                ]
                             )
                         elif not video_settings["keep_events"]:
                             # Delete the event files now.
-                            delete_file_list = []
-                            for _, event_info in movies.get(movie).items:
-                                delete_file_list.append(event_info.filename)
+                            delete_file_list = [
+                                event_info.filename
+                                for _, event_info in movie_info.items
+                            ]
                             _LOGGER.debug(
                                 f"Deleting {len(delete_file_list)} event files"
                             )
-                            delete_intermediate(delete_file_list)
+                            delete_intermediate(
+                                delete_file_list
+                                + [
+                                    get_sidecar_filename(filename)
+                                    for filename in delete_file_list
+                                ]
+                            )
         else:
             print(
                 f"{get_current_timestamp()}All folders have been processed, resulting movie files are located in "
@@ -2977,20 +3848,22 @@ def process_folders(source_folders, video_settings, delete_source):
         f"{get_current_timestamp()}Total processing time: {str(timedelta(seconds=int((end_time - start_time))))}"
     )
     if video_settings["notification"]:
+        message_values = {
+            "folders": "" if total_events < 2 else "s",
+            "total_folders": total_events,
+            "clips": "" if total_clips < 2 else "s",
+            "total_clips": total_clips,
+        }
         if movies_list is None:
             # No merging of movies occurred.
+            message_values.update({"target_folder": video_settings["target_folder"]})
             message = (
                 "{total_folders} folder{folders} with {total_clips} clip{clips} have been processed, "
-                "{target_folder} contains resulting files.".format(
-                    folders="" if len(event_list) < 2 else "s",
-                    total_folders=len(event_list),
-                    clips="" if total_clips < 2 else "s",
-                    total_clips=total_clips,
-                    target_folder=video_settings["target_folder"],
-                )
+                "{target_folder} contains resulting files.".format_map(message_values)
             )
         else:
-            if len(movies_list) == 1:
+            total_movies = len(movies_list)
+            if total_movies == 1:
                 # Only 1 movie was created.
                 print(
                     f"{get_current_timestamp()} Movie {movies_list[0][0]} with duration {movies_list[0][0]} "
@@ -3005,31 +3878,27 @@ def process_folders(source_folders, video_settings, delete_source):
                         f"{get_current_timestamp()}\t{movie_entry[0]} with duration {movie_entry[1]}"
                     )
 
-            if len(movies) == len(movies_list):
+            message_values.update(
+                {
+                    "total_movies": total_movies,
+                    "movies": "has" if total_movies == 1 else "have",
+                    "all_movies": len(movies),
+                }
+            )
+            if len(movies) == total_movies:
                 # Number of movies created matches how many we should have created.
                 message = (
                     "{total_folders} folder{folders} with {total_clips} clip{clips} have been processed, "
-                    "{total_movies} movie {movies} been created.".format(
-                        folders="" if len(event_list) < 2 else "s",
-                        total_folders=len(event_list),
-                        clips="" if total_clips < 2 else "s",
-                        total_clips=total_clips,
-                        total_movies=len(movies_list),
-                        movies="has" if len(movies_list) == 1 else "have",
+                    "{total_movies} movie {movies} been created.".format_map(
+                        message_values
                     )
                 )
             else:
                 # Seems creation of some movies failed.
                 message = (
                     "{total_folders} folder{folders} with {total_clips} clip{clips} have been processed, "
-                    "{total_movies} {movies} been created out of {all_movies}.".format(
-                        folders="" if len(event_list) < 2 else "s",
-                        total_folders=len(event_list),
-                        clips="" if total_clips < 2 else "s",
-                        total_clips=total_clips,
-                        total_movies=len(movies_list),
-                        movies="has" if len(movies_list) == 1 else "have",
-                        all_movies=len(movies),
+                    "{total_movies} {movies} been created out of {all_movies}.".format_map(
+                        message_values
                     )
                 )
 
@@ -3077,10 +3946,11 @@ def notify_windows(title, subtitle, message):
 
     # noinspection PyBroadException
     try:
-        # noinspection PyUnresolvedReferences,PyPackageRequirements
-        from win10toast import ToastNotifier
-
         if TOASTER_INSTANCE is None:
+            # Only import win10toast the first time a notification is sent.
+            # noinspection PyUnresolvedReferences,PyPackageRequirements
+            from win10toast import ToastNotifier
+
             TOASTER_INSTANCE = ToastNotifier()
 
         TOASTER_INSTANCE.show_toast(
@@ -3090,8 +3960,6 @@ def notify_windows(title, subtitle, message):
             duration=5,
             icon_path=resource_path("tesla_dashcam.ico"),
         )
-
-        run(["notify-send", f'"{title} {subtitle}"', f'"{message}"'])
     except Exception:
         pass
 
@@ -3114,9 +3982,103 @@ def notify(title, subtitle, message):
         notify_linux(title, subtitle, message)
 
 
+def print_notify(subtitle, message, system_notification):
+    """Print the message and also send it as notification if requested."""
+    print(f"{get_current_timestamp()}{message}")
+    if system_notification:
+        notify("TeslaCam", subtitle, message)
+
+
+def get_camera_area(camera_layout):
+    """Returns the area (left, top, right, bottom) of the video covered by the camera."""
+    return (
+        camera_layout.xpos,
+        camera_layout.ypos,
+        camera_layout.xpos + camera_layout.width,
+        camera_layout.ypos + camera_layout.height,
+    )
+
+
+def areas_overlap(area, other_area):
+    """Returns True if the 2 areas overlap."""
+    return (
+        area[0] < other_area[2]
+        and other_area[0] < area[2]
+        and area[1] < other_area[3]
+        and other_area[1] < area[3]
+    )
+
+
+def cameras_cover_video(layout_settings, cameras):
+    """Returns True if the cameras together cover the whole video without overlapping."""
+    video_area = layout_settings.video_width * layout_settings.video_height
+    camera_areas = []
+    for camera in cameras:
+        camera_layout = layout_settings.cameras(camera)
+        camera_area = get_camera_area(camera_layout)
+        if (
+            camera_area[0] < 0
+            or camera_area[1] < 0
+            or camera_area[2] > layout_settings.video_width
+            or camera_area[3] > layout_settings.video_height
+        ):
+            return False
+
+        for other_area in camera_areas:
+            if areas_overlap(camera_area, other_area):
+                return False
+
+        camera_areas.append(camera_area)
+        video_area -= camera_layout.width * camera_layout.height
+
+    return video_area == 0
+
+
+def add_update_check_arguments(parser):
+    """Add the arguments for the update check to the parser."""
+    update_check_group = parser.add_argument_group(
+        title="Update Check", description="Check for updates"
+    )
+    update_check_group.add_argument(
+        "--check_for_update",
+        dest="check_for_updates",
+        action="store_true",
+        help="Check for update and exit.",
+    )
+    update_check_group.add_argument(
+        "--no-check_for_update",
+        dest="no_check_for_updates",
+        action="store_true",
+        help="A check for new updates is performed every time. With this parameter that can be disabled",
+    )
+    update_check_group.add_argument(
+        "--include_test",
+        dest="include_beta",
+        action="store_true",
+        help="Include test (beta) releases when checking for updates.",
+    )
+
+
 def main() -> int:
     """Main function"""
 
+    # With --version or --check_for_update the program exits right away, these are
+    # parsed first so that ffmpeg does not have to be located and all other arguments
+    # do not have to be set up for it. Any other arguments provided are validated by
+    # the full parser first.
+    early_parser = MyArgumentParser(
+        add_help=False, allow_abbrev=False, fromfile_prefix_chars="@"
+    )
+    early_parser.add_argument(
+        "--version", action="version", version=" %(prog)s " + VERSION_STR
+    )
+    add_update_check_arguments(early_parser)
+    early_args, remaining_args = early_parser.parse_known_args()
+    if early_args.check_for_updates and not remaining_args:
+        if not check_for_update(early_args.include_beta, True, False):
+            return 1
+        return 0
+
     loglevels = dict(
         (logging.getLevelName(level), level) for level in [10, 20, 30, 40, 50]
     )
@@ -3678,7 +4640,7 @@ def main() -> int:
             action="store_true",
             default=argparse.SUPPRESS,
             help="R|Use GPU acceleration, only enable if supported by hardware.\n"
-            " --gpu_type has to be provided as well when enabling this parameter",
+            " If --gpu_type is not provided then it is determined based on the encoders supported by ffmpeg.",
         )
 
         advancedencoding_group.add_argument(
@@ -3687,8 +4649,8 @@ def main() -> int:
             if PLATFORM == "linux"
             else ["nvidia", "intel", "vaapi"],
             type=str.lower,
-            help="Type of graphics card (GPU) in the system. This determines the encoder that will be used."
-            "This parameter is mandatory if --gpu is provided.",
+            help="Type of graphics card (GPU) in the system. This determines the encoder that will be used. "
+            "If not provided with --gpu then it is determined based on the encoders supported by ffmpeg.",
         )
 
     advancedencoding_group.add_argument(
@@ -3738,6 +4700,24 @@ def main() -> int:
         "much as frames would just be duplicated. Default is 24fps which is the standard for movies and TV shows",
     )
 
+    advancedencoding_group.add_argument(
+        "--parallel",
+        required=False,
+        type=int,
+        default=1,
+        help="Number of clips to encode at the same time. Each clip is encoded by its own ffmpeg process, "
+        "increasing this can reduce processing time on systems with multiple cores.",
+    )
+
+    advancedencoding_group.add_argument(
+        "--threads",
+        required=False,
+        type=int,
+        default=None,
+        help="Number of threads each ffmpeg process uses for filtering and software encoding. Default is the "
+        "number of CPUs divided by --parallel.",
+    )
+
     if internal_ffmpeg:
         advancedencoding_group.add_argument(
             "--ffmpeg",
@@ -3775,27 +4755,7 @@ def main() -> int:
         "encoding that provides this.",
     )
 
-    update_check_group = parser.add_argument_group(
-        title="Update Check", description="Check for updates"
-    )
-    update_check_group.add_argument(
-        "--check_for_update",
-        dest="check_for_updates",
-        action="store_true",
-        help="Check for update and exit.",
-    )
-    update_check_group.add_argument(
-        "--no-check_for_update",
-        dest="no_check_for_updates",
-        action="store_true",
-        help="A check for new updates is performed every time. With this parameter that can be disabled",
-    )
-    update_check_group.add_argument(
-        "--include_test",
-        dest="include_beta",
-        action="store_true",
-        help="Include test (beta) releases when checking for updates.",
-    )
+    add_update_check_arguments(parser)
 
     args = parser.parse_args()
 
@@ -3807,6 +4767,9 @@ def main() -> int:
     _LOGGER.debug(f"Arguments : {args}")
     _LOGGER.debug(f"Platform is {PLATFORM}")
     _LOGGER.debug(f"Processor is {PROCESSOR}")
+    # Determine local timezone once now instead of by the first clips being processed
+    # in parallel.
+    _LOGGER.debug(f"Local timezone is {get_local_timezone()}")
 
     # Check that any mutual exclusive items are not both provided.
     if "speed_up" in args and "slow_down" in args:
@@ -3823,92 +4786,42 @@ def main() -> int:
         )
         return 1
 
-    if not args.no_check_for_updates or args.check_for_updates:
-        release_info = check_latest_release(args.include_beta)
-        if release_info is not None:
-            new_version = False
-            if release_info.get("tag_name") is not None:
-                github_version = release_info.get("tag_name").split(".")
-                if len(github_version) == 3:
-                    # Release tags normally start with v. If that is the case
-                    # then strip the v.
-                    try:
-                        major_version = int(github_version[0])
-                    except ValueError:
-                        major_version = int(github_version[0][1:])
-
-                    minor_version = int(github_version[1])
-                    if release_info.get("prerelease"):
-                        # Drafts will have b and then beta number.
-                        patch_version = int(github_version[2].split("b")[0])
-                        beta_version = int(github_version[2].split("b")[1])
-                    else:
-                        patch_version = int(github_version[2])
-                        beta_version = -1
-
-                    if major_version == VERSION["major"]:
-                        if minor_version == VERSION["minor"]:
-                            if patch_version == VERSION["patch"]:
-                                if beta_version > VERSION["beta"] or (
-                                    beta_version == -1 and VERSION["beta"] != -1
-                                ):
-                                    new_version = True
-                            elif patch_version > VERSION["patch"]:
-                                new_version = True
-                        elif minor_version > VERSION["minor"]:
-                            new_version = True
-                    elif major_version > VERSION["major"]:
-                        new_version = True
-
-            if new_version:
-                beta = ""
-                if release_info.get("prerelease"):
-                    beta = "beta "
-
-                release_notes = ""
-                if not args.check_for_updates:
-                    if args.system_notification:
-                        notify(
-                            "TeslaCam",
-                            "Update available",
-                            f"New {beta}release {release_info.get('tag_name')} is available. You are on version "
-                            f"{VERSION_STR}",
-                        )
-                    release_notes = (
-                        "Use --check_for_update to get latest " "release notes."
-                    )
+    if args.parallel < 1:
+        print(
+            f"{get_current_timestamp()}Option --parallel has to be 1 or higher, {args.parallel} was provided."
+        )
+        return 1
 
-                print(
-                    f"{get_current_timestamp()}New {beta}release {release_info.get('tag_name')} is available for "
-                    f"download ({release_info.get('html_url')}). You are currently on {VERSION_STR}. {release_notes}"
-                )
+    # The CPUs are shared by the clips being encoded at the same time.
+    ffmpeg_threads = args.threads
+    if ffmpeg_threads is None:
+        ffmpeg_threads = max(1, (os.cpu_count() or 1) // args.parallel)
+    elif ffmpeg_threads < 1:
+        print(
+            f"{get_current_timestamp()}Option --threads has to be 1 or higher, {args.threads} was provided."
+        )
+        return 1
 
-                if args.check_for_updates:
-                    print(
-                        f"{get_current_timestamp()}You can download the new release from: "
-                        f"{release_info.get('html_url')}"
-                    )
-                    print(
-                        f"{get_current_timestamp()}Release Notes:\n {release_info.get('body')}"
-                    )
-                    return 0
-            else:
-                if args.check_for_updates:
-                    print(
-                        f"{get_current_timestamp()}{VERSION_STR} is the latest release available."
-                    )
-                    return 0
-        else:
-            print(f"{get_current_timestamp()} Did not retrieve latest version info.")
+    if not args.no_check_for_updates or args.check_for_updates:
+        update_checked = check_for_update(
+            args.include_beta, args.check_for_updates, args.system_notification
+        )
+        # Exit the same way as when only --check_for_update was provided.
+        if args.check_for_updates:
+            return 0 if update_checked else 1
 
     internal_ffmpeg = getattr(args, "ffmpeg", None) is None and internal_ffmpeg
     ffmpeg = getattr(args, "ffmpeg", ffmpeg_default) or ""
-    if not internal_ffmpeg and (ffmpeg == "" or which(ffmpeg) is None):
-        print(
-            f"{get_current_timestamp()}ffmpeg is a requirement, unable to find {ffmpeg} executable. Please ensure it exist and is located "
-            f"within PATH environment or provide full path using parameter --ffmpeg."
-        )
-        return 1
+    if not internal_ffmpeg:
+        # Resolve to the full path once instead of PATH being searched every time ffmpeg is executed.
+        ffmpeg_path = which(ffmpeg) if ffmpeg != "" else None
+        if ffmpeg_path is None:
+            print(
+                f"{get_current_timestamp()}ffmpeg is a requirement, unable to find {ffmpeg} executable. Please ensure it exist and is located "
+                f"within PATH environment or provide full path using parameter --ffmpeg."
+            )
+            return 1
+        ffmpeg = ffmpeg_path
 
     if internal_ffmpeg and PLATFORM == "darwin" and PROCESSOR == "arm":
         print(
@@ -3920,22 +4833,9 @@ def main() -> int:
     if args.clip_pos:
         # If clip positions have been provided it is custom.
         layout_settings = MovieLayout()
-    elif args.layout == "PERSPECTIVE":
-        layout_settings = FullScreen()
-        layout_settings.perspective = True
     else:
-        if args.layout == "WIDESCREEN":
-            layout_settings = WideScreen()
-        elif args.layout == "FULLSCREEN":
-            layout_settings = FullScreen()
-        elif args.layout == "CROSS":
-            layout_settings = Cross()
-        elif args.layout == "DIAMOND":
-            layout_settings = Diamond()
-        else:
-            layout_settings = FullScreen()
-
-        layout_settings.perspective = args.perspective
+        layout_settings = MOVIE_LAYOUT.get(args.layout, FullScreen)()
+        layout_settings.perspective = args.layout == "PERSPECTIVE" or args.perspective
 
     # Determine if left and right cameras should be swapped or not.
     # No more arguments related to cameras (i.e .scale, include or not) can be processed from now on.
@@ -3943,15 +4843,6 @@ def main() -> int:
     # From this point forward left can mean right camera if we're swapping output.
     layout_settings.swap_front_rear = args.swap_frontrear
 
-    layout_settings.cameras("front").include = not args.no_front
-    layout_settings.cameras("left").include = not args.no_left
-    if layout_settings.swap_front_rear:
-        layout_settings.cameras("front").include = not args.no_rear
-        layout_settings.cameras("rear").include = not args.no_front
-    else:
-        layout_settings.cameras("front").include = not args.no_front
-        layout_settings.cameras("rear").include = not args.no_rear
-
     # Check if either rear or mirror argument has been provided.
     # If front camera then default to mirror, if no front camera then default to rear.
     side_camera_as_mirror = (
@@ -3974,12 +4865,22 @@ def main() -> int:
         else args.swap_leftright
     )
 
+    camera_include = {
+        "front": not args.no_front,
+        "rear": not args.no_rear,
+        "left": not args.no_left,
+        "right": not args.no_right,
+    }
+    if layout_settings.swap_front_rear:
+        camera_include.update(
+            {"front": camera_include["rear"], "rear": camera_include["front"]}
+        )
     if layout_settings.swap_left_right:
-        layout_settings.cameras("left").include = not args.no_right
-        layout_settings.cameras("right").include = not args.no_left
-    else:
-        layout_settings.cameras("left").include = not args.no_left
-        layout_settings.cameras("right").include = not args.no_right
+        camera_include.update(
+            {"left": camera_include["right"], "right": camera_include["left"]}
+        )
+    for camera, include in camera_include.items():
+        layout_settings.cameras(camera).include = include
 
     # For scale first set the main clip one if provided, this than allows camera specific ones to override for
     # that camera.
@@ -3989,11 +4890,14 @@ def main() -> int:
     if main_scale is not None:
         layout_settings.scale = main_scale.get("scale", layout_settings.scale)
 
-    for scale in scaling:
-        camera = scale.get("camera", "").lower()
-        if camera in ["front", "left", "right", "rear"]:
-            if camera_scale := scale.get("scale"):
-                layout_settings.cameras(camera).scale = camera_scale
+    camera_scales = {
+        scale.get("camera", "").lower(): scale["scale"]
+        for scale in scaling
+        if scale.get("scale")
+    }
+    for camera in ["front", "left", "right", "rear"]:
+        if camera_scale := camera_scales.get(camera):
+            layout_settings.cameras(camera).scale = camera_scale
 
     for pos in parser.args_to_dict(args.clip_pos, "x_y_pos"):
         camera = pos.get("camera", "").lower()
@@ -4008,11 +4912,12 @@ def main() -> int:
             x_pos = pos.get("x_pos", x_pos)
             y_pos = pos.get("y_pos", y_pos)
 
+            camera_layout = layout_settings.cameras(camera)
             if x_pos is not None and x_pos.isnumeric():
-                layout_settings.cameras(camera).xpos = x_pos
+                camera_layout.xpos = x_pos
 
             if y_pos is not None and y_pos.isnumeric():
-                layout_settings.cameras(camera).ypos = y_pos
+                camera_layout.ypos = y_pos
 
     layout_settings.clip_order = args.clip_order.split(",")
 
@@ -4043,51 +4948,143 @@ def main() -> int:
 
     ffmpeg_black_video = ";" + black_base + black_size
 
+    # If only 1 camera is included and it covers the whole video then there is no
+    # need to put it on top of a background, it can be used as is.
+    full_video_camera = None
+    included_cameras = [
+        camera
+        for camera in layout_settings.clip_order
+        if layout_settings.cameras(camera).include
+    ]
+    if len(included_cameras) == 1:
+        camera_layout = layout_settings.cameras(included_cameras[0])
+        if (
+            camera_layout.xpos == 0
+            and camera_layout.ypos == 0
+            and camera_layout.width == layout_settings.video_width
+            and camera_layout.height == layout_settings.video_height
+        ):
+            full_video_camera = included_cameras[0]
+            ffmpeg_base = ""
+
+    # If the included cameras together cover the whole video without overlapping each
+    # other then they are stacked in one go instead of being overlaid one by one on top
+    # of a background.
+    stack_cameras = len(included_cameras) > 1 and cameras_cover_video(
+        layout_settings, included_cameras
+    )
+    if stack_cameras:
+        ffmpeg_base = ""
+
     input_clip = "base"
-    ffmpeg_video_position = ""
+    # Filter for putting each camera in its position, and the filter to use instead
+    # if there is no clip for the camera (None if the background has to be shown).
+    ffmpeg_video_positions = []
+    ffmpeg_skip_cameras = set()
     ffmpeg_camera = {}
 
+    ffmpeg_camera_background = {}
+
     for camera in layout_settings.clip_order:
-        if layout_settings.cameras(camera).include:
+        camera_layout = layout_settings.cameras(camera)
+        camera_label = FFMPEG_CAMERA_LABEL[camera]
+
+        # Background to use for this camera when there is no clip for it, only the
+        # duration differs between clips thus leaving that to be filled in.
+        ffmpeg_camera_background.update(
+            {
+                camera: ffmpeg_black_video.format(
+                    duration="{duration}",
+                    width=camera_layout.width,
+                    height=camera_layout.height,
+                )
+                + f"[{camera_label}]"
+            }
+        )
+
+        if camera_layout.include:
             ffmpeg_camera.update(
                 {
-                    camera: (
-                        "setpts=PTS-STARTPTS, "
-                        "scale={clip_width}x{clip_height} {mirror}{options}"
-                        " [{camera}]".format(
-                            clip_width=layout_settings.cameras(camera).width,
-                            clip_height=layout_settings.cameras(camera).height,
-                            mirror=mirror[camera],
-                            options=layout_settings.cameras(camera).options,
-                            camera=camera,
-                        )
+                    camera: FFMPEG_CAMERA_FILTER.format(
+                        clip_width=camera_layout.width,
+                        clip_height=camera_layout.height,
+                        mirror=mirror[camera],
+                        options=camera_layout.options,
+                        fps=f", fps={args.fps}" if camera == full_video_camera else "",
+                        camera=camera_label,
                     )
                 }
             )
 
-            ffmpeg_video_position += ";[{input_clip}][{camera}] overlay=eof_action=pass:repeatlast=0:x={x_pos}:y={y_pos} [{camera}1]".format(
-                input_clip=input_clip,
-                camera=camera,
-                x_pos=layout_settings.cameras(camera).xpos,
-                y_pos=layout_settings.cameras(camera).ypos,
+            if camera == full_video_camera:
+                input_clip = camera_label
+                continue
+
+            if stack_cameras:
+                continue
+
+            # A camera without clip is shown in the background color. If the camera
+            # does not overlap any of the other cameras then this is the same as not
+            # putting anything on top of the background.
+            camera_area = get_camera_area(camera_layout)
+            skip_position = None
+            if not any(
+                areas_overlap(
+                    camera_area, get_camera_area(layout_settings.cameras(other_camera))
+                )
+                for other_camera in included_cameras
+                if other_camera != camera
+            ):
+                skip_position = FFMPEG_CAMERA_SKIP.format(
+                    input_clip=input_clip, camera=camera_label
+                )
+                ffmpeg_skip_cameras.add(camera)
+
+            ffmpeg_video_positions.append(
+                (
+                    camera,
+                    FFMPEG_CAMERA_OVERLAY.format(
+                        input_clip=input_clip,
+                        camera=camera_label,
+                        x_pos=camera_layout.xpos,
+                        y_pos=camera_layout.ypos,
+                    ),
+                    skip_position,
+                )
             )
-            input_clip = f"{camera}1"
+            input_clip = f"{camera_label}1"
+
+    if stack_cameras:
+        stack_inputs = "".join(
+            f"[{FFMPEG_CAMERA_LABEL[camera]}]" for camera in included_cameras
+        )
+        stack_layout = "|".join(
+            f"{camera_layout.xpos}_{camera_layout.ypos}"
+            for camera_layout in map(layout_settings.cameras, included_cameras)
+        )
+        ffmpeg_video_positions.append(
+            (
+                None,
+                f";{stack_inputs} xstack=inputs={len(included_cameras)}:layout={stack_layout}, "
+                f"fps={args.fps} [stack]",
+                None,
+            )
+        )
+        input_clip = "stack"
 
     # Text Overlay
-    text_overlay_format = (
-        args.text_overlay_fmt if args.text_overlay_fmt is not None else None
-    )
+    text_overlay_format = args.text_overlay_fmt
 
     # Timestamp format
-    timestamp_format = (
-        args.timestamp_format if args.timestamp_format is not None else None
-    )
+    timestamp_format = args.timestamp_format
 
     filter_counter = 0
-    filter_string = ";[{input_clip}] {filter} [tmp{filter_counter}]"
+    filter_string = ";[{input_clip}] {filter} [t{filter_counter}]"
     ffmpeg_timestamp = ""
+    # Nothing related to the font is checked if no text is put on the video.
     if not args.no_timestamp and text_overlay_format is not None:
-        if layout_settings.font.font is None:
+        font = layout_settings.font
+        if font.font is None:
             print(
                 f"{get_current_timestamp()}Unable to get a font file for platform {PLATFORM}. Please provide valid font file using "
                 f"--font or disable timestamp using --no-timestamp."
@@ -4095,11 +5092,7 @@ def main() -> int:
             return 0
 
         # noinspection PyPep8
-        temp_font_file = (
-            f"c:\{layout_settings.font.font}"
-            if PLATFORM == "win32"
-            else layout_settings.font.font
-        )
+        temp_font_file = f"c:\{font.font}" if PLATFORM == "win32" else font.font
         if not os.path.isfile(temp_font_file):
             print(
                 f"{get_current_timestamp()}Font file {temp_font_file} does not exist. Provide a valid font file using --font or"
@@ -4114,10 +5107,10 @@ def main() -> int:
 
         # noinspection PyPep8,PyPep8,PyPep8
         ffmpeg_timestamp = (
-            ffmpeg_timestamp + f"drawtext=fontfile={layout_settings.font.font}:"
-            f"fontcolor={layout_settings.font.color}:fontsize={layout_settings.font.size}:"
+            f"drawtext=fontfile={font.font}:"
+            f"fontcolor={font.color}:fontsize={font.size}:"
             "borderw=2:bordercolor=black@1.0:"
-            f"x={layout_settings.font.halign}:y={layout_settings.font.valign}:"
+            f"x={font.halign}:y={font.valign}:"
             "text='__USERTEXT__'"
         )
 
@@ -4126,7 +5119,7 @@ def main() -> int:
             filter=ffmpeg_timestamp,
             filter_counter=filter_counter,
         )
-        input_clip = f"tmp{filter_counter}"
+        input_clip = f"t{filter_counter}"
         filter_counter += 1
 
     speed = args.slow_down if "slow_down" in args else ""
@@ -4138,7 +5131,7 @@ def main() -> int:
             filter=f"setpts={speed}*PTS",
             filter_counter=filter_counter,
         )
-        input_clip = f"tmp{filter_counter}"
+        input_clip = f"t{filter_counter}"
         filter_counter += 1
 
     ffmpeg_motiononly = ""
@@ -4148,7 +5141,7 @@ def main() -> int:
             filter=f"mpdecimate=hi=64*48, setpts=N/FRAME_RATE/TB",
             filter_counter=filter_counter,
         )
-        input_clip = f"tmp{filter_counter}"
+        input_clip = f"t{filter_counter}"
         filter_counter += 1
 
     ffmpeg_params = ["-preset", args.compression, "-crf", MOVIE_QUALITY[args.quality]]
@@ -4163,27 +5156,36 @@ def main() -> int:
     ffmpeg_hwdev = []
     ffmpeg_hwout = []
     ffmpeg_hwupload = ""
+    ffmpeg_hwdecode = []
     if not "enc" in args:
-        encoding = args.encoding if "encoding" in args else "x264"
+        encoding = getattr(args, "encoding", "x264")
 
         # For x265 add QuickTime compatibility
         if encoding == "x265":
-            video_encoding = video_encoding + ["-vtag", "hvc1"]
+            video_encoding += ["-vtag", "hvc1"]
 
         # GPU acceleration enabled
         if use_gpu:
             if PLATFORM == "darwin":
                 print(f"{get_current_timestamp()}GPU acceleration is enabled")
-                video_encoding = video_encoding + ["-allow_sw", "1"]
+                video_encoding += ["-allow_sw", "1"]
                 encoding = encoding + "_mac"
+                ffmpeg_hwdecode = MOVIE_HWACCEL_DECODE["mac"]
 
             else:
                 if args.gpu_type is None:
+                    args.gpu_type = get_gpu_type(encoding, get_ffmpeg_encoders(ffmpeg))
+                    if args.gpu_type is None:
+                        print(
+                            f"{get_current_timestamp()}Unable to determine the GPU type, parameter --gpu_type "
+                            f"is mandatory when parameter --gpu is used."
+                        )
+                        return 0
+
                     print(
-                        f"{get_current_timestamp()}Parameter --gpu_type is mandatory when parameter "
-                        f"--use_gpu is used."
+                        f"{get_current_timestamp()}Using GPU type {args.gpu_type} based on the encoders "
+                        f"supported by ffmpeg."
                     )
-                    return 0
 
                 # Confirm that GPU acceleration with this encoding is supported.
                 if MOVIE_ENCODING.get(encoding + "_" + args.gpu_type) is None:
@@ -4194,6 +5196,7 @@ def main() -> int:
                 else:
                     print(f"{get_current_timestamp()}GPU acceleration is enabled.")
                     encoding = encoding + "_" + args.gpu_type
+                    ffmpeg_hwdecode = MOVIE_HWACCEL_DECODE.get(args.gpu_type, [])
 
                     # If using vaapi hw acceleration this takes the decoding and filter processing done in software
                     # and passes it up to the GPU for hw accelerated encoding.
@@ -4203,41 +5206,56 @@ def main() -> int:
                             filter=f"format=nv12,hwupload",
                             filter_counter=filter_counter,
                         )
-                        input_clip = f"tmp{filter_counter}"
+                        input_clip = f"t{filter_counter}"
                         filter_counter += 1
 
                         if PLATFORM == "linux":
-                            ffmpeg_hwdev = ffmpeg_hwdev + [
+                            ffmpeg_hwdev += [
                                 "-vaapi_device",
-                                "/dev/dri/renderD128",
+                                VAAPI_DEVICE,
                             ]
-                            ffmpeg_hwout = ffmpeg_hwout + [
+                            ffmpeg_hwout += [
                                 "-hwaccel_output_format",
                                 "vaapi",
                             ]
                     elif args.gpu_type == "qsv":
                         if PLATFORM == "linux":
-                            ffmpeg_hwdev = ffmpeg_hwdev + [
+                            ffmpeg_hwdev += [
                                 "-qsv_device",
                                 "/dev/dri/renderD128",
                             ]
-                            ffmpeg_hwout = ffmpeg_hwout + ["-hwaccel", "qsv"]
 
             bit_rate = str(int(10000 * layout_settings.scale)) + "K"
-            video_encoding = video_encoding + ["-b:v", bit_rate]
+            video_encoding += ["-b:v", bit_rate]
 
-        video_encoding = video_encoding + ["-c:v", MOVIE_ENCODING[encoding]]
+        video_encoder = MOVIE_ENCODING[encoding]
+
+        # Hardware encoders are not included in every ffmpeg build.
+        if use_gpu:
+            ffmpeg_encoders = get_ffmpeg_encoders(ffmpeg)
+            if ffmpeg_encoders and video_encoder not in ffmpeg_encoders:
+                print(
+                    f"{get_current_timestamp()}Encoder {video_encoder} does not seem to be supported by ffmpeg "
+                    f"{ffmpeg}, creation of the video files might fail."
+                )
+
+        # Software encoders use the threads available to each ffmpeg process. Hardware
+        # encoders do the encoding on the GPU, additional encoder threads would only
+        # compete with decoding and filtering.
+        encoder_threads = 1
+        if video_encoder in ["libx264", "libx265"]:
+            encoder_threads = ffmpeg_threads
+        video_encoding += ["-threads", str(encoder_threads)]
     else:
-        video_encoding = video_encoding + ["-c:v", args.enc]
+        video_encoder = args.enc
+
+    video_encoding += ["-c:v", video_encoder]
 
-    ffmpeg_params = ffmpeg_params + video_encoding
+    ffmpeg_params += video_encoding
 
     # Determine the target folder and filename.
     # If no extension then assume it is a folder.
-    if (
-        os.path.splitext(args.output)[1] is not None
-        and os.path.splitext(args.output)[1] != ""
-    ):
+    if os.path.splitext(args.output)[1] != "":
         target_folder, target_filename = os.path.split(args.output)
         if target_folder is None or target_folder == "":
             # If nothing in target_filename then no folder was given,
@@ -4250,9 +5268,7 @@ def main() -> int:
         target_filename = None
 
     # Convert target folder to absolute path if relative path has been provided.
-    target_folder = os.path.abspath(
-        os.path.expanduser(os.path.expandvars(target_folder))
-    )
+    target_folder = get_absolute_path(target_folder)
 
     # Ensure folder if not already exist and if not can be created
     if not make_folder("--output", target_folder):
@@ -4261,9 +5277,7 @@ def main() -> int:
     temp_folder = args.temp_dir
     if temp_folder is not None:
         # Convert temp folder to absolute path if relative path has been provided
-        temp_folder = os.path.abspath(
-            os.path.expanduser(os.path.expandvars(args.temp_dir))
-        )
+        temp_folder = get_absolute_path(temp_folder)
 
         if not make_folder("--temp_dir", temp_folder):
             return 0
@@ -4288,31 +5302,23 @@ def main() -> int:
         if runtype == "RUN":
             runtype = "MONITOR_ONCE"
 
-    start_timestamp = None
-    if args.start_timestamp is not None:
+    timestamps = {"Start": args.start_timestamp, "End": args.end_timestamp}
+    for name, value in timestamps.items():
+        if value is None:
+            continue
         try:
-            start_timestamp = isoparse(args.start_timestamp)
-            if start_timestamp.tzinfo is None:
-                start_timestamp = start_timestamp.astimezone(get_localzone())
+            timestamps[name] = parse_timestamp(value)
         except ValueError as e:
             print(
-                f"{get_current_timestamp()}Start timestamp ({args.start_timestamp}) provided is in an incorrect "
+                f"{get_current_timestamp()}{name} timestamp ({value}) provided is in an incorrect "
                 f"format. Parsing error: {str(e)}."
             )
             return 1
+    start_timestamp = timestamps["Start"]
+    end_timestamp = timestamps["End"]
 
-    end_timestamp = None
-    if args.end_timestamp is not None:
-        try:
-            end_timestamp = isoparse(args.end_timestamp)
-            if end_timestamp.tzinfo is None:
-                end_timestamp = end_timestamp.astimezone(get_localzone())
-        except ValueError as e:
-            print(
-                f"{get_current_timestamp()}End timestamp ({args.end_timestamp}) provided is in an incorrect "
-                f"format. Parsing error: {str(e)}."
-            )
-            return 1
+    # Merge template is only set if --merge was provided.
+    merge_group_template = getattr(args, "merge_group_template", None)
 
     video_settings = {
         "source_folder": source_list,
@@ -4322,10 +5328,8 @@ def main() -> int:
         "target_filename": target_filename,
         "temp_dir": temp_folder,
         "run_type": runtype,
-        "merge_subdirs": True if "merge_group_template" in args else False,
-        "merge_group_template": args.merge_group_template
-        if "merge_group_template" in args
-        else None,
+        "merge_subdirs": merge_group_template is not None,
+        "merge_group_template": merge_group_template,
         "merge_timestamp_format": args.merge_timestamp_format,
         "chapter_offset": args.chapter_offset,
         "movie_filename": None,
@@ -4336,19 +5340,24 @@ def main() -> int:
         "movie_layout": args.layout,
         "movie_speed": speed,
         "video_encoding": video_encoding,
-        "movie_encoding": args.encoding if "encoding" in args else "x264",
+        "movie_encoding": getattr(args, "encoding", "x264"),
         "fps": args.fps,
+        "parallel": args.parallel,
         "movie_compression": args.compression,
         "movie_quality": args.quality,
-        "background": ffmpeg_black_video,
+        "camera_background": ffmpeg_camera_background,
         "ffmpeg_exec": ffmpeg,
         "ffmpeg_hwdev": ffmpeg_hwdev,
         "ffmpeg_hwout": ffmpeg_hwout,
+        "ffmpeg_hwdecode": ffmpeg_hwdecode,
+        "ffmpeg_filter_threads": ["-filter_complex_threads", str(ffmpeg_threads)],
         "base": ffmpeg_base,
         "video_layout": layout_settings,
-        "clip_positions": ffmpeg_video_position,
+        "clip_positions": ffmpeg_video_positions,
+        "skip_cameras": ffmpeg_skip_cameras,
         "ffmpeg_text_overlay": ffmpeg_timestamp,
         "text_overlay_format": text_overlay_format,
+        "text_overlay_template": compile_template(text_overlay_format),
         "timestamp_format": timestamp_format,
         "ffmpeg_speed": ffmpeg_speed,
         "ffmpeg_motiononly": ffmpeg_motiononly,
@@ -4364,59 +5373,60 @@ def main() -> int:
         "sentry_start_offset": getattr(args, "sentry_start_offset", None),
         "sentry_end_offset": getattr(args, "sentry_end_offset", None),
         "sentry_offset": args.sentry_offset,
-        "skip_existing": args.skip_existing,
+        # Existing movies are always skipped when monitoring.
+        "skip_existing": args.skip_existing or runtype in ["MONITOR", "MONITOR_ONCE"],
     }
 
     # Confirm the merge variables provided are accurate.
-    dummy_event = Event(folder="dummy")
-    if (
-        dummy_event.template(
-            video_settings["merge_group_template"],
-            video_settings["merge_timestamp_format"],
-            video_settings,
-        )
-        is None
-    ):
-        # Invalid merge template provided, exiting.
-        return 1
-
-    replacement_strings = {
-        "start_timestamp": "start_timestamp",
-        "end_timestamp": "end_timestamp",
-        "local_timestamp_rolling": "local_timestamp_rolling",
-        "event_timestamp_countdown": "event_timestamp_countdown",
-        "event_timestamp_countdown_rolling": "event_timestamp_countdown_rolling",
-        "event_timestamp": "event_timestamp",
-        "event_city": "event_city",
-        "event_reason": "event_reason",
-        "event_latitude": "event_latitude",
-        "event_longitude": "event_longitude",
-    }
+    if video_settings["merge_subdirs"]:
+        dummy_event = Event(folder="dummy")
+        if (
+            dummy_event.template(
+                video_settings["merge_group_template"],
+                video_settings["merge_timestamp_format"],
+                video_settings,
+            )
+            is None
+        ):
+            # Invalid merge template provided, exiting.
+            return 1
 
-    try:
-        # Try to replace strings!
-        _ = video_settings["text_overlay_format"].format(**replacement_strings)
-    except KeyError as e:
-        _LOGGER.error(
-            "Bad string format: Invalid variable %s provided in --text_overlay_format",
-            str(e),
-        )
-        return 1
+    # Check the variables used without formatting the string.
+    for _, field_name, _, _ in Formatter().parse(text_overlay_format):
+        if field_name is None:
+            continue
+        variable = field_name.partition(".")[0].partition("[")[0]
+        if variable not in TEXT_OVERLAY_VARIABLES:
+            _LOGGER.error(
+                "Bad string format: Invalid variable %s provided in --text_overlay_format",
+                repr(variable),
+            )
+            return 1
 
     _LOGGER.debug(f"Video Settings {video_settings}")
     _LOGGER.debug(f"Layout Settings {layout_settings}")
 
     # If we constantly run and monitor for drive added or not.
-    if video_settings["run_type"] in ["MONITOR", "MONITOR_ONCE"]:
-
-        video_settings.update({"skip_existing": True})
+    if runtype in ["MONITOR", "MONITOR_ONCE"]:
 
         trigger_exist = False
+        if target_filename is not None:
+            target_base, target_ext = os.path.splitext(target_filename)
+
         if monitor_file is None:
+            if PLATFORM == "linux":
+                monitor_changed, monitor_observer = start_drive_watch()
+            else:
+                monitor_changed, monitor_observer = start_folder_watch(
+                    MONITOR_DRIVE_FOLDERS.get(PLATFORM, [])
+                )
             print(
                 f"{get_current_timestamp()}Monitoring for TeslaCam Drive to be inserted. Press CTRL-C to stop"
             )
         else:
+            monitor_changed, monitor_observer = start_folder_watch(
+                [os.path.dirname(os.path.abspath(monitor_file))]
+            )
             print(
                 f"{get_current_timestamp()}Monitoring for trigger {monitor_file} to exist. Press CTRL-C to stop"
             )
@@ -4436,7 +5446,7 @@ def main() -> int:
                                 f"Press CTRL-C to stop"
                             )
 
-                        sleep(MONITOR_SLEEP_TIME)
+                        wait_for_change(monitor_changed)
                         trigger_exist = False
                         continue
 
@@ -4444,112 +5454,91 @@ def main() -> int:
                     # keep on waiting.
                     if trigger_exist:
                         _LOGGER.debug(f"TeslaCam Drive still attached")
-                        sleep(MONITOR_SLEEP_TIME)
+                        wait_for_change(monitor_changed)
                         continue
 
                     # Got a folder, append what was provided as source unless
                     # . was provided in which case everything is done.
-                    source_folder_list = []
-                    for folder in video_settings["source_folder"]:
-                        if folder == ".":
-                            source_folder_list.append(folder)
-                        else:
-                            source_folder_list.append(
-                                os.path.join(source_folder, folder)
-                            )
+                    source_folder_list = [
+                        folder if folder == "." else os.path.join(source_folder, folder)
+                        for folder in source_list
+                    ]
 
                     message = f"TeslaCam folder found on {source_partition}."
                 else:
                     # Wait till trigger file exist (can also be folder).
                     if not os.path.exists(monitor_file):
                         _LOGGER.debug(f"Trigger file {monitor_file} does not exist.")
-                        sleep(MONITOR_SLEEP_TIME)
+                        wait_for_change(monitor_changed)
                         trigger_exist = False
                         continue
 
                     if trigger_exist:
-                        sleep(MONITOR_SLEEP_TIME)
+                        wait_for_change(monitor_changed)
                         continue
 
                     message = f"Trigger {monitor_file} exist."
                     trigger_exist = True
 
                     # Set monitor path, make sure what was provided is a file first otherwise get path.
+                    trigger_is_file = os.path.isfile(monitor_file)
                     monitor_path = monitor_file
-                    if os.path.isfile(monitor_file):
+                    if trigger_is_file:
                         monitor_path, _ = os.path.split(monitor_file)
 
                     # If . is provided then source folder is path where monitor file exist.
-                    source_folder_list = []
-                    for folder in video_settings["source_folder"]:
-                        if folder == ".":
-                            source_folder_list.append(monitor_path)
-                        else:
-                            # If source path provided is absolute then use that for source path
-                            if os.path.isabs(folder):
-                                source_folder_list.append(folder)
-                            else:
-                                # Path provided is relative, hence based on path of trigger file.
-                                source_folder_list.append(
-                                    os.path.join(monitor_path, folder)
-                                )
-
-                print(f"{get_current_timestamp()}{message}")
-                if args.system_notification:
-                    notify("TeslaCam", "Started", message)
+                    # Relative paths are based on path of trigger file, os.path.join keeps
+                    # absolute paths as they are.
+                    source_folder_list = [
+                        (
+                            monitor_path
+                            if folder == "."
+                            else os.path.join(monitor_path, folder)
+                        )
+                        for folder in source_list
+                    ]
+
+                print_notify("Started", message, args.system_notification)
 
                 if len(source_folder_list) == 1:
                     print(
                         f"{get_current_timestamp()}Retrieving all files from {source_folder_list[0]}"
                     )
                 else:
-                    print(f"{get_current_timestamp()}Retrieving all files from: ")
-                    for folder in source_folder_list:
-                        print(
-                            f"{get_current_timestamp()}                          {folder}"
-                        )
+                    current_timestamp = get_current_timestamp()
+                    folders = "\n".join(
+                        f"{current_timestamp}                          {folder}"
+                        for folder in source_folder_list
+                    )
+                    print(f"{current_timestamp}Retrieving all files from: \n{folders}")
 
-                if video_settings["run_type"] == "MONITOR":
+                if target_filename is None:
+                    movie_filename = f"{datetime.now():%Y-%m-%d_%H_%M}"
+                elif runtype == "MONITOR":
                     # We will continue to monitor hence we need to
                     # ensure we always have a unique final movie name.
                     movie_filename = (
-                        datetime.today().strftime("%Y-%m-%d_%H_%M")
-                        if video_settings["target_filename"] is None
-                        else os.path.splitext(video_settings["target_filename"])[0]
-                        + "_"
-                        + datetime.today().strftime("%Y-%m-%d_%H_%M")
-                        + os.path.splitext(video_settings["target_filename"])[1]
+                        f"{target_base}_{datetime.now():%Y-%m-%d_%H_%M}{target_ext}"
                     )
                 else:
-                    movie_filename = (
-                        datetime.today().strftime("%Y-%m-%d_%H_%M")
-                        if video_settings["target_filename"] is None
-                        else video_settings["target_filename"]
-                    )
+                    movie_filename = target_filename
                 _LOGGER.debug(
                     f"video_settings attribute movie_filename set to {movie_filename}."
                 )
-                video_settings.update({"movie_filename": movie_filename})
+                video_settings["movie_filename"] = movie_filename
 
                 process_folders(source_folder_list, video_settings, args.delete_source)
 
-                print(f"{get_current_timestamp()}Processing of movies has completed.")
-                if args.system_notification:
-                    notify(
-                        "TeslaCam", "Completed", "Processing of movies has completed."
-                    )
+                print_notify(
+                    "Completed",
+                    "Processing of movies has completed.",
+                    args.system_notification,
+                )
 
                 # Stop if we're only to monitor once and then exit.
-                if video_settings["run_type"] == "MONITOR_ONCE":
-                    if monitor_file is not None:
-                        if os.path.isfile(monitor_file):
-                            try:
-                                os.remove(monitor_file)
-                            except OSError as exc:
-                                print(
-                                    f"{get_current_timestamp()}Error trying to remove trigger file "
-                                    f"{monitor_file}: {exc}"
-                                )
+                if runtype == "MONITOR_ONCE":
+                    if monitor_file is not None and trigger_is_file:
+                        remove_trigger_file(monitor_file)
 
                     print(
                         f"{get_current_timestamp()}Exiting monitoring as asked process once."
@@ -4562,13 +5551,8 @@ def main() -> int:
                         f"{get_current_timestamp()}Waiting for TeslaCam Drive to be ejected. Press CTRL-C to stop"
                     )
                 else:
-                    if os.path.isfile(monitor_file):
-                        try:
-                            os.remove(monitor_file)
-                        except OSError as exc:
-                            print(
-                                f"{get_current_timestamp()}Error trying to remove trigger file {monitor_file}: {exc}"
-                            )
+                    if trigger_is_file:
+                        if not remove_trigger_file(monitor_file):
                             break
                         trigger_exist = False
 
@@ -4584,16 +5568,19 @@ def main() -> int:
             except KeyboardInterrupt:
                 print(f"{get_current_timestamp()}Monitoring stopped due to CTRL-C.")
                 break
+
+        if monitor_observer is not None:
+            monitor_observer.stop()
     else:
         movie_filename = (
-            datetime.today().strftime("%Y-%m-%d_%H_%M")
+            f"{datetime.now():%Y-%m-%d_%H_%M}"
             if video_settings["target_filename"] is None
             else video_settings["target_filename"]
         )
         _LOGGER.debug(
             f"video_settings attribute movie_filename set to {movie_filename}."
         )
-        video_settings.update({"movie_filename": movie_filename})
+        video_settings["movie_filename"] = movie_filename
 
         process_folders(
             video_settings["source_folder"], video_settings, args.delete_source